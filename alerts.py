@@ -0,0 +1,194 @@
+# alerts.py
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import urllib.request
+from dataclasses import dataclass, field
+
+import streamlit as st
+
+
+logger = logging.getLogger(__name__)
+
+# Symptoms from the Daily Log list that warrant a notification the first time they appear
+RED_FLAG_SYMPTOMS = {"Blurred vision", "Memory problems", "Nausea"}
+
+STATE_PATH = "alert_state.db"
+
+SEVERITY_THRESHOLD = 8      # absolute severity that always alerts
+SEVERITY_DELTA = 3          # jump above the rolling baseline that alerts
+BASELINE_ALPHA = 0.3        # weight of the newest log in the rolling baseline
+MIN_BASELINE_LOGS = 3       # logs needed before delta alerts are trusted
+
+
+@dataclass
+class Alert:
+    patient_id: str
+    reasons: list
+    symptom_severity: int
+    baseline: float
+    date: str
+    contacts: list = field(default_factory=list)
+
+
+@dataclass
+class PatientState:
+    # Constant-size per-patient state, updated once per log
+    count: int = 0
+    baseline: float = 0.0
+    seen_red_flags: set = field(default_factory=set)
+
+
+def parse_symptoms(symptoms):
+    return {s.strip() for s in str(symptoms or "").split(",") if s.strip()}
+
+
+def evaluate(state, log_entry):
+    severity = int(log_entry.get("symptom_severity") or 0)
+    symptoms = parse_symptoms(log_entry.get("symptoms"))
+    reasons = []
+
+    if severity >= SEVERITY_THRESHOLD:
+        reasons.append(f"Symptom severity {severity}/10")
+    if state.count >= MIN_BASELINE_LOGS and severity - state.baseline >= SEVERITY_DELTA:
+        reasons.append(f"Severity rose to {severity} from a baseline of {state.baseline:.1f}")
+    new_red_flags = (symptoms & RED_FLAG_SYMPTOMS) - state.seen_red_flags
+    for symptom in sorted(new_red_flags):
+        reasons.append(f"New symptom: {symptom}")
+
+    baseline = state.baseline
+    state.baseline = severity if state.count == 0 else (
+        BASELINE_ALPHA * severity + (1 - BASELINE_ALPHA) * state.baseline
+    )
+    state.count += 1
+    state.seen_red_flags |= new_red_flags
+    return reasons, baseline
+
+
+class AlertSink:
+    def send(self, alert):
+        raise NotImplementedError
+
+
+class LogSink(AlertSink):
+    def send(self, alert):
+        logger.warning("Alert for %s (%s): %s", alert.patient_id, ", ".join(alert.contacts), "; ".join(alert.reasons))
+
+
+class MemorySink(AlertSink):
+    # Keeps alerts in a list so the pipeline can be exercised locally
+    def __init__(self):
+        self.alerts = []
+
+    def send(self, alert):
+        self.alerts.append(alert)
+
+
+class WebhookSink(AlertSink):
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alert):
+        payload = json.dumps(alert.__dict__).encode("utf-8")
+        request = urllib.request.Request(self.url, data=payload, headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(request, timeout=self.timeout).close()
+
+
+class AlertStateStore:
+    """Per-patient rule state in SQLite, so baselines and seen red flags survive restarts and are
+    shared by every server process on the host."""
+
+    def __init__(self, path=STATE_PATH):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS alert_state (
+                patient_id TEXT PRIMARY KEY,
+                count INTEGER NOT NULL,
+                baseline REAL NOT NULL,
+                seen_red_flags TEXT NOT NULL
+            );
+        """)
+
+    def update(self, patient_id, fn):
+        """Load the patient's state, apply `fn` to it and save it, atomically across processes."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT count, baseline, seen_red_flags FROM alert_state WHERE patient_id = ?", (patient_id,)
+            ).fetchone()
+            state = PatientState(row[0], row[1], parse_symptoms(row[2])) if row else PatientState()
+            result = fn(state)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO alert_state (patient_id, count, baseline, seen_red_flags) VALUES (?, ?, ?, ?)",
+                (patient_id, state.count, state.baseline, ", ".join(sorted(state.seen_red_flags)))
+            )
+            self.conn.execute("COMMIT")
+            return result
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+
+class AlertPipeline:
+    def __init__(self, sink, store=None):
+        self.sink = sink
+        self.store = store or AlertStateStore()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="alert-pipeline", daemon=True)
+        self._worker.start()
+
+    def submit(self, log_entry, contacts=()):
+        # Never blocks the caller: evaluation happens on the worker thread
+        self._queue.put_nowait((dict(log_entry), list(contacts)))
+
+    def join(self):
+        self._queue.join()
+
+    def process(self, log_entry, contacts=()):
+        reasons, baseline = self.store.update(log_entry["patient_id"], lambda state: evaluate(state, log_entry))
+        if not reasons:
+            return None
+        alert = Alert(
+            patient_id=log_entry["patient_id"],
+            reasons=reasons,
+            symptom_severity=int(log_entry.get("symptom_severity") or 0),
+            baseline=round(baseline, 2),
+            date=log_entry.get("date", ""),
+            contacts=[c for c in contacts if c]
+        )
+        self.sink.send(alert)
+        return alert
+
+    def _run(self):
+        while True:
+            log_entry, contacts = self._queue.get()
+            try:
+                self.process(log_entry, contacts)
+            except Exception:
+                logger.exception("Failed to process alert for %s", log_entry.get("patient_id"))
+            finally:
+                self._queue.task_done()
+
+
+def create_alert_sink():
+    config = st.secrets.get("alerts", {})
+    if config.get("WEBHOOK_URL"):
+        return WebhookSink(config["WEBHOOK_URL"])
+    return LogSink()
+
+
+@st.cache_resource
+def get_alert_pipeline():
+    path = st.secrets.get("alerts", {}).get("STATE_PATH", STATE_PATH)
+    return AlertPipeline(create_alert_sink(), AlertStateStore(path))
+
+
+def alert_contacts():
+    return [
+        st.session_state.get("patient_emergency_contact", ""),
+        st.secrets.get("alerts", {}).get("CLINICIAN_CONTACT", "")
+    ]
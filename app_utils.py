@@ -1,13 +1,100 @@
 # app_utils.py
 import streamlit as st
+import pickle
+import threading
 from datetime import date
 from supabase import Client, create_client
 
 
+SYMPTOMS = [
+    "Headache", "Dizziness", "Nausea", "Fatigue", "Blurred vision",
+    "Trouble concentrating", "Trouble sleeping", "Irritability",
+    "Sensitivity to light", "Sensitivity to noise", "Memory problems"
+]
+
+
+# Tenant (club/team) used for profiles created before teams existed
+DEFAULT_TENANT = "default"
+
+MODEL_NAME = "balanced_MLP_best_model"
+# Optional model trained on the embedding plus the feature store's structured log features
+COMBINED_MODEL_NAME = "combined_MLP_model"
+
+
+@st.cache_resource
 def create_supabase_client():
+    # One client per process so every session reuses its HTTP connection pool
     return create_client(st.secrets["supabase"]["SUPABASE_URL"], st.secrets["supabase"]["SUPABASE_KEY"])
 
 
+@st.cache_resource
+def load_model(model_name):
+    with open(model_name, "rb") as file_name:
+        return pickle.load(file_name)
+
+
+def current_tenant():
+    return st.session_state.get("team_id") or DEFAULT_TENANT
+
+
+def tenant_table_name(table_key, tenant_id=None):
+    # Large tenants can be given a dedicated log table under [tenants.<team_id>] in secrets;
+    # everyone else shares the partitioned tables configured under [supabase]. Profiles stay
+    # in the shared table since login has to find them before the tenant is known.
+    routes = st.secrets.get("tenants", {}).get(tenant_id or current_tenant(), {})
+    return routes.get(table_key, st.secrets["supabase"][table_key])
+
+
+def is_team_staff(tenant_id=None):
+    # Staff (clinicians, coaches) are listed by login subject under [tenants.<team_id>] STAFF
+    staff = st.secrets.get("tenants", {}).get(tenant_id or current_tenant(), {}).get("STAFF", [])
+    return st.user.sub in staff
+
+
+def is_operator():
+    # Operators (whoever runs the deployment) are listed by login subject under [admin] OPERATORS
+    return st.user.sub in st.secrets.get("admin", {}).get("OPERATORS", [])
+
+
+def tenant_table(client, table_key, tenant_id=None):
+    return client.table(tenant_table_name(table_key, tenant_id))
+
+
+def select_patient_rows(client, table_key, patient_id, columns="*", tenant_id=None):
+    """Select a patient's rows from the tenant's partition, filtered on the (team_id, patient_id) index prefix."""
+    tenant_id = tenant_id or current_tenant()
+    return tenant_table(client, table_key, tenant_id)\
+        .select(columns)\
+        .eq("team_id", tenant_id)\
+        .eq("patient_id", patient_id)
+
+
+class LogVersions:
+    """Per-patient counters bumped on every saved log, shared by all sessions of the server."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {}
+
+    def get(self, patient_id):
+        return self._versions.get(patient_id, 0)
+
+    def bump(self, patient_id):
+        with self._lock:
+            self._versions[patient_id] = self._versions.get(patient_id, 0) + 1
+
+
+@st.cache_resource
+def get_log_versions():
+    return LogVersions()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_patient_logs(_client, patient_id, tenant_id, version=None):
+    """All of a patient's logs. Pass get_log_versions().get(patient_id) as `version` so a saved log
+    invalidates the entry for every session, not just the one that saved it."""
+    return select_patient_rows(_client, "SUPABASE_PATIENT_LOG_TABLE", patient_id, tenant_id=tenant_id).execute().data
+
 
 def calculate_age(dob_str):
    dob_obj = date.fromisoformat(dob_str)
@@ -0,0 +1,101 @@
+# benchmarks/bench_notes_search.py
+# Builds a synthetic notes index and reports keyword/semantic query latency.
+#
+#   python benchmarks/bench_notes_search.py --notes 1000000 --patients 20000
+import argparse
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from notes_search import NotesIndex, EMBEDDING_DIMENSIONS
+
+
+VOCABULARY = (
+    "headache dizziness nausea pressure neck pain rest ibuprofen paracetamol screen time reduce "
+    "return to training light jog physio balance vestibular therapy follow up scan mri ct normal "
+    "vision blurry ringing ears fog memory lapse sleep nap anxiety mood school modified schedule "
+    "cleared contact drills symptoms improving worse after exercise hydrate avoid alcohol"
+).split()
+
+
+def synthetic_note(rng):
+    return " ".join(rng.choices(VOCABULARY, k=rng.randint(4, 20)))
+
+
+def build_index(path, notes, patients, batch_size, seed):
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    index = NotesIndex(path=path)
+    patient_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(patients)]
+    for start in range(0, notes, batch_size):
+        count = min(batch_size, notes - start)
+        entries = [{
+            "token": str(uuid.UUID(int=rng.getrandbits(128))),
+            "patient_id": rng.choice(patient_ids),
+            "date": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "other_symptoms": synthetic_note(rng) if rng.random() < 0.5 else "",
+            "doctor_notes": synthetic_note(rng),
+        } for _ in range(count)]
+        vectors = np_rng.standard_normal((count, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        index.add_many(entries, vectors)
+    return index, patient_ids
+
+
+def measure(fn, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notes search latency benchmark")
+    parser.add_argument("--notes", type=int, default=100_000)
+    parser.add_argument("--patients", type=int, default=2_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--full-scan-queries", type=int, default=10, help="queries for semantic / all")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        index, patient_ids = build_index(
+            os.path.join(tmp, "notes.db"), args.notes, args.patients, args.batch_size, args.seed
+        )
+        print(f"Indexed {args.notes:,} notes for {args.patients:,} patients in {time.perf_counter() - start:.1f}s")
+
+        rng = random.Random(args.seed + 1)
+        np_rng = np.random.default_rng(args.seed + 1)
+        words = [" ".join(rng.sample(VOCABULARY, rng.randint(1, 2))) for _ in range(args.queries)]
+        vectors = np_rng.standard_normal((args.queries, EMBEDDING_DIMENSIONS), dtype=np.float32)
+        cohort = rng.sample(patient_ids, min(50, len(patient_ids)))
+
+        cases = {
+            "keyword / patient": lambda i: index.keyword_search(words[i], [rng.choice(patient_ids)]),
+            "keyword / cohort": lambda i: index.keyword_search(words[i], cohort),
+            "keyword / all": lambda i: index.keyword_search(words[i]),
+            "semantic / patient": lambda i: index.semantic_search(None, [rng.choice(patient_ids)], vector=vectors[i]),
+            "semantic / cohort": lambda i: index.semantic_search(None, cohort, vector=vectors[i]),
+            "semantic / all": lambda i: index.semantic_search(None, vector=vectors[i]),
+        }
+        print(f"{'query':<20}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, fn in cases.items():
+            p50, p95 = measure(fn, range(args.full_scan_queries if name == "semantic / all" else args.queries))
+            print(f"{name:<20}{p50:>10.2f}{p95:>10.2f}")
+        # Linux reports ru_maxrss in KiB
+        print(f"Peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# benchmarks/bench_pages.py
+# Drives every data page headlessly with Streamlit's AppTest against local fakes
+# for Supabase and OpenAI, and compares render time, memory and throughput with
+# a stored baseline.
+#
+#   python benchmarks/bench_pages.py --patients 50 --logs 365 --db-latency 0.03
+#   python benchmarks/bench_pages.py --update-baseline --runs 5
+#   python benchmarks/bench_pages.py --ci     # fails on regressions or a missing baseline
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+import openai
+import streamlit
+from streamlit.testing.v1 import AppTest
+from fakes import FakeOpenAI, FakeSupabase, synthetic_patients
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+PROFILE_TABLE = "patient_profile"
+LOG_TABLE = "patient_log"
+
+
+def save_daily_log(at):
+    next(b for b in at.button if b.label == "Save Daily Log").click().run()
+
+
+def classify(at):
+    at.text_input[0].input("Fell down while heading the ball")
+    at.text_input[1].input("Head")
+    next(b for b in at.button if b.label == "Apply").click().run()
+
+
+PAGES = {
+    "login": ("login.py", None),
+    "daily_log": ("pages/01_Daily_Log.py", save_daily_log),
+    "dashboard": ("pages/02_Dashbord.py", None),
+    "classification": ("pages/00_Concussion_Classification.py", classify),
+}
+
+
+# Pages whose timings swing by up to ~40% between invocations on a shared vCPU (background
+# warm-up, alert and embedding threads compete with the page run); classification stays within ~10%
+PAGE_TOLERANCE = {"login": 0.4, "daily_log": 0.4, "dashboard": 0.4}
+
+
+def install_fakes(db_latency, openai_latency):
+    db = FakeSupabase(db_latency)
+    import app_utils
+    app_utils.create_client = lambda url, key: db
+    FakeOpenAI.latency = openai_latency
+    openai.OpenAI = FakeOpenAI
+    if "embeddings" in sys.modules:
+        sys.modules["embeddings"].client = FakeOpenAI()
+    return db
+
+
+def install_secrets(secrets, path):
+    # A real secrets file rather than AppTest.secrets: those are only patched in while a script
+    # runs, and the app's background threads (login warm-up, embeddings) read secrets afterwards
+    with open(path, "w") as f:
+        for section, values in secrets.items():
+            f.write(f"[{section}]\n")
+            for key, value in values.items():
+                f.write(f"{key} = {json.dumps(value)}\n")
+    streamlit.config.set_option("secrets.files", [path])
+
+
+def join_warmup(at):
+    # The login warm-up keeps running after the script; let it finish so it doesn't overlap the next timing
+    if "warmup" in at.session_state:
+        at.session_state["warmup"].thread.join()
+
+
+def visit(page, patient_id):
+    # Every visit enters through login.py like a real session, so multipage features
+    # (st.page_link, st.switch_page) resolve against the app's pages/ directory
+    path, interact = PAGES[page]
+    at = AppTest.from_file(os.path.join(ROOT, "login.py"), default_timeout=120)
+    at.session_state["patient_id"] = patient_id
+    if path != "login.py":
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"login raised: {at.exception[0].message}")
+        join_warmup(at)
+        at.switch_page(path)
+    start = time.perf_counter()
+    at.run()
+    if interact is not None and not at.exception:
+        interact(at)
+    elapsed = time.perf_counter() - start
+    join_warmup(at)
+    if at.exception:
+        raise RuntimeError(f"{page} raised: {at.exception[0].message}")
+    return elapsed
+
+
+def bench_page(page, patient_ids, visits, concurrency, seed):
+    rng = random.Random(seed)
+    patients = [rng.choice(patient_ids) for _ in range(visits)]
+    # Untimed first visit: one-off imports and model loads would otherwise dominate p95
+    visit(page, patients[0])
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = sorted(pool.map(lambda p: visit(page, p), patients))
+    return {
+        "p50_ms": round(statistics.median(timings) * 1000, 2),
+        "p95_ms": round(timings[max(int(len(timings) * 0.95) - 1, 0)] * 1000, 2),
+        # From the page runs alone; the login and warm-up each visit starts with aren't counted
+        "throughput_rps": round(visits * concurrency / sum(timings), 2),
+    }
+
+
+def bench_runs(page, patient_ids, visits, memory_visits, concurrency, seed, runs):
+    """Median of each metric over `runs` repetitions, plus each metric's relative spread across them."""
+    results = []
+    for run in range(runs):
+        result = bench_page(page, patient_ids, visits, concurrency, seed + run)
+        result["peak_mib"] = peak_memory(page, patient_ids, memory_visits, seed + run)
+        results.append(result)
+    metrics, spread = {}, {}
+    for key in results[0]:
+        values = [r[key] for r in results]
+        metrics[key] = round(statistics.median(values), 2)
+        spread[key] = round((max(values) - min(values)) / metrics[key], 3) if metrics[key] else 0
+    metrics["spread"] = spread
+    return metrics
+
+
+def peak_memory(page, patient_ids, visits, seed):
+    # Separate, sequential pass: tracemalloc slows allocation-heavy code, so it stays off while timing
+    rng = random.Random(seed)
+    tracemalloc.start()
+    try:
+        for _ in range(visits):
+            visit(page, rng.choice(patient_ids))
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for page, metrics in results.items():
+        previous = baseline.get(page)
+        if not previous:
+            continue
+        # Metrics that varied more than the page's tolerance while the baseline was recorded get that much slack
+        page_tolerance = max(tolerance, PAGE_TOLERANCE.get(page, 0))
+        allowed = {key: max(page_tolerance, spread) for key, spread in previous.get("spread", {}).items()}
+        for key in ("p50_ms", "p95_ms", "peak_mib"):
+            if metrics[key] > previous[key] * (1 + allowed.get(key, page_tolerance)):
+                regressions.append(f"{page}.{key}: {previous[key]} -> {metrics[key]}")
+        throughput_tolerance = min(allowed.get("throughput_rps", page_tolerance), 0.9)
+        if metrics["throughput_rps"] < previous["throughput_rps"] * (1 - throughput_tolerance):
+            regressions.append(f"{page}.throughput_rps: {previous['throughput_rps']} -> {metrics['throughput_rps']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-page render benchmark")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--patients", type=int, default=20)
+    parser.add_argument("--logs", type=int, default=180, help="logs per synthetic patient")
+    parser.add_argument("--visits", type=int, default=20, help="page visits per page")
+    parser.add_argument("--memory-visits", type=int, default=3, help="page visits in the memory pass")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=3, help="repetitions per page; metrics are their median")
+    parser.add_argument("--db-latency", type=float, default=0.02, help="seconds per Supabase request")
+    parser.add_argument("--openai-latency", type=float, default=0.2, help="seconds per embedding request")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--ci", action="store_true", help="fail when no baseline is stored")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    streamlit.user = SimpleNamespace(is_logged_in=True, sub="benchmark", name="Benchmark")
+    db = install_fakes(args.db_latency, args.openai_latency)
+    patient_ids = synthetic_patients(db, PROFILE_TABLE, LOG_TABLE, args.patients, args.logs, args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        secrets = {
+            "supabase": {
+                "SUPABASE_URL": "http://localhost", "SUPABASE_KEY": "fake",
+                "SUPABASE_TABLE": PROFILE_TABLE, "SUPABASE_PATIENT_LOG_TABLE": LOG_TABLE,
+            },
+            "openai": {"OPENAI_API_KEY": "fake"},
+            "search": {"INDEX_PATH": os.path.join(tmp, "notes_index.db")},
+            "features": {"STORE_PATH": os.path.join(tmp, "feature_store.db")},
+            "alerts": {"STATE_PATH": os.path.join(tmp, "alert_state.db")},
+        }
+        install_secrets(secrets, os.path.join(tmp, "secrets.toml"))
+        results = {}
+        print(f"{'page':<16}{'p50 ms':>10}{'p95 ms':>10}{'peak MiB':>10}{'req/s':>10}")
+        for page in args.pages:
+            results[page] = bench_runs(
+                page, patient_ids, args.visits, args.memory_visits, args.concurrency, args.seed, args.runs
+            )
+            m = results[page]
+            print(f"{page:<16}{m['p50_ms']:>10}{m['p95_ms']:>10}{m['peak_mib']:>10}{m['throughput_rps']:>10}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("No baseline stored yet; run with --update-baseline to create one.")
+        sys.exit(1 if args.ci else 0)
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    if regressions:
+        print("Regressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
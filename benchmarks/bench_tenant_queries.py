@@ -0,0 +1,96 @@
+# benchmarks/bench_tenant_queries.py
+# Shows that per-patient query time stays flat as the total log count grows when
+# queries go through the (team_id, patient_id, date, time, token) index. Uses
+# SQLite so it runs anywhere; the access pattern matches sql/tenant_partitioning.sql.
+#
+#   python benchmarks/bench_tenant_queries.py --steps 100000 1000000 5000000
+import argparse
+import random
+import sqlite3
+import statistics
+import time
+from datetime import date, timedelta
+
+
+PAGE_SIZE = 40
+LOGS_PER_PATIENT = 180
+
+
+def create_table(conn):
+    conn.executescript("""
+        CREATE TABLE patient_log (
+            team_id TEXT NOT NULL,
+            token TEXT NOT NULL,
+            patient_id TEXT NOT NULL,
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            symptom_severity INTEGER,
+            mood INTEGER,
+            PRIMARY KEY (team_id, token)
+        );
+        CREATE INDEX patient_log_tenant_history_idx
+            ON patient_log (team_id, patient_id, date DESC, time DESC, token DESC);
+    """)
+
+
+def grow(conn, rng, start_patient, rows, teams):
+    start_date = date(2020, 1, 1)
+    patients = []
+    batch = []
+    patient = start_patient
+    while len(batch) < rows:
+        team_id, patient_id = f"team-{patient % teams}", f"patient-{patient}"
+        patients.append((team_id, patient_id))
+        for day in range(min(LOGS_PER_PATIENT, rows - len(batch))):
+            batch.append((
+                team_id, f"{patient_id}-{day}", patient_id, (start_date + timedelta(days=day)).isoformat(),
+                f"{rng.randint(6, 22):02d}:{rng.randint(0, 59):02d}", rng.randint(1, 10), rng.randint(1, 5)
+            ))
+        patient += 1
+    with conn:
+        conn.executemany("INSERT INTO patient_log VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+    return patients
+
+
+def measure(conn, patients, queries, rng):
+    recent, history = [], []
+    for _ in range(queries):
+        team_id, patient_id = rng.choice(patients)
+        start = time.perf_counter()
+        conn.execute(
+            "SELECT * FROM patient_log WHERE team_id = ? AND patient_id = ? "
+            "ORDER BY date DESC, time DESC, token DESC LIMIT ?", (team_id, patient_id, PAGE_SIZE)
+        ).fetchall()
+        recent.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        conn.execute(
+            "SELECT * FROM patient_log WHERE team_id = ? AND patient_id = ?", (team_id, patient_id)
+        ).fetchall()
+        history.append((time.perf_counter() - start) * 1000)
+    return statistics.median(recent), statistics.median(history)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-patient query time vs. total row count")
+    parser.add_argument("--steps", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="total row counts to measure at")
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    conn = sqlite3.connect(":memory:")
+    create_table(conn)
+    patients = []
+    total = 0
+    print(f"{'total rows':>12}{'patients':>10}{'recent p50 ms':>15}{'history p50 ms':>16}")
+    for step in sorted(args.steps):
+        patients += grow(conn, rng, len(patients), step - total, args.teams)
+        total = step
+        recent, history = measure(conn, patients, args.queries, rng)
+        print(f"{total:>12,}{len(patients):>10,}{recent:>15.3f}{history:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
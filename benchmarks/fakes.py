@@ -0,0 +1,203 @@
+# benchmarks/fakes.py
+# In-process stand-ins for Supabase and OpenAI with configurable latency.
+import random
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app_utils import SYMPTOMS
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+OPERATORS = {
+    "eq": lambda a, b: a == b, "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a > b, "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b, "lte": lambda a, b: a <= b,
+}
+
+
+def _split_top_level(expression):
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in expression:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    return parts + [current]
+
+
+def _parse_logic(kind, expression):
+    """Turn a PostgREST logical filter (e.g. `a.lt.1,and(b.eq."x",c.gt.2)`) into a predicate."""
+    predicates = []
+    for part in _split_top_level(expression):
+        if part.startswith(("and(", "or(")):
+            inner_kind, inner = part.split("(", 1)
+            predicates.append(_parse_logic(inner_kind, inner[:-1]))
+            continue
+        column, op, value = part.split(".", 2)
+        value = value[1:-1].replace('\\"', '"') if value.startswith('"') else value
+        predicates.append(
+            lambda row, c=column, o=OPERATORS[op], v=value: row.get(c) is not None and o(str(row[c]), v)
+        )
+    combine = all if kind == "and" else any
+    return lambda row: combine(p(row) for p in predicates)
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.orders = []
+        self.row_limit = None
+        self.row_offset = 0
+        self.rows_to_insert = None
+
+    def select(self, *columns, **kwargs):
+        return self
+
+    def insert(self, rows):
+        self.rows_to_insert = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def _filter(self, column, predicate):
+        self.filters.append(lambda row: row.get(column) is not None and predicate(row[column]))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, lambda v: v == value)
+
+    def neq(self, column, value):
+        return self._filter(column, lambda v: v != value)
+
+    def gt(self, column, value):
+        return self._filter(column, lambda v: v > value)
+
+    def gte(self, column, value):
+        return self._filter(column, lambda v: v >= value)
+
+    def lt(self, column, value):
+        return self._filter(column, lambda v: v < value)
+
+    def lte(self, column, value):
+        return self._filter(column, lambda v: v <= value)
+
+    def ilike(self, column, pattern):
+        needle = pattern.strip("%").lower()
+        return self._filter(column, lambda v: needle in str(v).lower())
+
+    def or_(self, expression):
+        self.filters.append(_parse_logic("or", expression))
+        return self
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def range(self, start, end):
+        self.row_offset = start
+        self.row_limit = end - start + 1
+        return self
+
+    def execute(self):
+        self.db.wait()
+        with self.db.lock:
+            rows = self.db.tables.setdefault(self.table, [])
+            if self.rows_to_insert is not None:
+                rows.extend(dict(row) for row in self.rows_to_insert)
+                return FakeResponse([dict(row) for row in self.rows_to_insert])
+            result = [dict(row) for row in rows if all(f(row) for f in self.filters)]
+        for column, desc in reversed(self.orders):
+            result.sort(key=lambda row: row.get(column) or "", reverse=desc)
+        result = result[self.row_offset:]
+        if self.row_limit is not None:
+            result = result[:self.row_limit]
+        return FakeResponse(result)
+
+
+class FakeSupabase:
+    """Mimics the subset of the supabase-py query builder the pages use."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.tables = {}
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+class FakeOpenAI:
+    """Returns deterministic pseudo-random embeddings after a fixed delay."""
+
+    latency = 0.0
+
+    def __init__(self, *args, **kwargs):
+        self.embeddings = SimpleNamespace(create=self._create_embedding)
+
+    def _create_embedding(self, input, model, dimensions=256):
+        time.sleep(self.latency)
+        rng = random.Random(input)
+        embedding = [rng.gauss(0, 1) for _ in range(dimensions)]
+        return SimpleNamespace(data=[SimpleNamespace(embedding=embedding)])
+
+
+def synthetic_patients(db, profile_table, log_table, patients, logs_per_patient, seed=0):
+    rng = random.Random(seed)
+    patient_ids = []
+    for _ in range(patients):
+        patient_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        patient_ids.append(patient_id)
+        diagnosis_date = date(2025, 1, 1) - timedelta(days=logs_per_patient)
+        db.tables.setdefault(profile_table, []).append({
+            "patient_id": patient_id,
+            "patient_name": f"Patient {len(patient_ids)}",
+            "dob": date(2000 + rng.randint(0, 10), rng.randint(1, 12), rng.randint(1, 28)).isoformat(),
+            "emergency_contact": "0000000000",
+            "condition": "Concussion",
+            "diagnosis_date": diagnosis_date.isoformat(),
+            "team_id": "default"
+        })
+        for day in range(logs_per_patient):
+            doctor_visited = rng.random() < 0.1
+            db.tables.setdefault(log_table, []).append({
+                "token": str(uuid.UUID(int=rng.getrandbits(128))),
+                "patient_id": patient_id,
+                "team_id": "default",
+                "date": (diagnosis_date + timedelta(days=day)).isoformat(),
+                "time": f"{rng.randint(6, 22):02d}:{rng.randint(0, 59):02d}",
+                "symptoms": ", ".join(rng.sample(SYMPTOMS, rng.randint(0, 3))),
+                "other_symptoms": "",
+                "medication_taken": rng.random() < 0.5,
+                "medication_name": "",
+                "doctor_visited": doctor_visited,
+                "doctor_type": "Neurologist" if doctor_visited else "",
+                "doctor_notes": "Rest and reduce screen time" if doctor_visited else "",
+                "symptom_severity": rng.randint(1, 10),
+                "sleep_quality": rng.choice(["Good", "Average", "Poor"]),
+                "physical_activity": rng.choice(["Light", "Moderate", "Intense", "None"]),
+                "mood": rng.randint(1, 5),
+                "logged_at": f"{(diagnosis_date + timedelta(days=day)).isoformat()}T12:00:00"
+            })
+    return patient_ids
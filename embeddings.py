@@ -17,4 +17,9 @@ def get_openai_embeddings(text: str) -> list[float]:
         dimensions=256
         )
 
-    return response.data[0].embedding
\ No newline at end of file
+    return response.data[0].embedding
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def get_query_embedding(text: str) -> list[float]:
+    # Search queries are embedded once; page reruns with the same query reuse the vector
+    return get_openai_embeddings(text)
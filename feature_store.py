@@ -0,0 +1,189 @@
+# feature_store.py
+import sqlite3
+import threading
+from datetime import date
+
+import numpy as np
+import streamlit as st
+
+from app_utils import SYMPTOMS
+
+
+STORE_PATH = "feature_store.db"
+WINDOW = 7      # logs in the rolling severity/mood window
+
+SLEEP_LEVELS = {"Poor": 0, "Average": 1, "Good": 2}
+ACTIVITY_LEVELS = {"None": 0, "Light": 1, "Moderate": 2, "Intense": 3}
+
+FEATURE_NAMES = (
+    [f"symptom_{s.lower().replace(' ', '_')}" for s in SYMPTOMS]
+    + [
+        "severity_last", "severity_mean_7", "severity_std_7", "severity_trend_7", "severity_mean_all",
+        "mood_last", "mood_mean_7", "sleep_quality", "physical_activity",
+        "medication_taken", "doctor_visited", "log_count", "days_since_diagnosis"
+    ]
+)
+FEATURE_SIZE = len(FEATURE_NAMES)
+DAYS_SINCE_DIAGNOSIS = FEATURE_NAMES.index("days_since_diagnosis")
+
+# Running state per patient: [log_count, severity_sum, severity window..., mood window...]
+STATE_SIZE = 2 + 2 * WINDOW
+
+
+def empty_state():
+    state = np.full(STATE_SIZE, np.nan, dtype=np.float32)
+    state[:2] = 0
+    return state
+
+
+def log_key(log_entry):
+    # Order logs are folded in; a rebuild replays them in this order
+    return f"{log_entry.get('date')} {log_entry.get('time')}"
+
+
+def update_state(state, log_entry):
+    """Fold one log into the running state and return (state, features) as float32 arrays."""
+    state = state.copy()
+    severity = float(log_entry.get("symptom_severity") or 0)
+    mood = float(log_entry.get("mood") or 0)
+    severities = state[2:2 + WINDOW]
+    moods = state[2 + WINDOW:]
+    severities[:] = np.roll(severities, -1)
+    moods[:] = np.roll(moods, -1)
+    severities[-1] = severity
+    moods[-1] = mood
+    state[0] += 1
+    state[1] += severity
+
+    symptoms = {s.strip() for s in str(log_entry.get("symptoms") or "").split(",")}
+    features = np.zeros(FEATURE_SIZE, dtype=np.float32)
+    features[:len(SYMPTOMS)] = [s in symptoms for s in SYMPTOMS]
+    features[len(SYMPTOMS):DAYS_SINCE_DIAGNOSIS] = [
+        severity,
+        np.nanmean(severities),
+        np.nanstd(severities),
+        severity - np.nanmean(severities),
+        state[1] / state[0],
+        mood,
+        np.nanmean(moods),
+        SLEEP_LEVELS.get(log_entry.get("sleep_quality"), 1),
+        ACTIVITY_LEVELS.get(log_entry.get("physical_activity"), 0),
+        bool(log_entry.get("medication_taken")),
+        bool(log_entry.get("doctor_visited")),
+        state[0]
+    ]
+    return state, features
+
+
+class FeatureStore:
+    """Per-patient structured log features, updated incrementally and kept in memory and SQLite.
+
+    A log older than the newest one already folded in (a backdated entry) can't be folded in
+    incrementally; it marks the patient stale until the next rebuild.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self._lock = threading.Lock()
+        self._cache = {}
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS patient_features (
+                patient_id TEXT PRIMARY KEY,
+                diagnosis_ordinal INTEGER,
+                state BLOB NOT NULL,
+                features BLOB NOT NULL,
+                newest_log TEXT,
+                stale INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(patient_features)")}
+        with self.conn:
+            if "newest_log" not in columns:
+                # Stores written before backdating was tracked are rebuilt on the next sync
+                self.conn.execute("ALTER TABLE patient_features ADD COLUMN newest_log TEXT")
+                self.conn.execute("ALTER TABLE patient_features ADD COLUMN stale INTEGER NOT NULL DEFAULT 1")
+        for patient_id, diagnosis_ordinal, state, features, newest_log, stale in self.conn.execute(
+            "SELECT patient_id, diagnosis_ordinal, state, features, newest_log, stale FROM patient_features"
+        ):
+            self._cache[patient_id] = (
+                diagnosis_ordinal,
+                np.frombuffer(state, dtype=np.float32),
+                np.frombuffer(features, dtype=np.float32),
+                newest_log,
+                bool(stale)
+            )
+
+    def update(self, patient_id, log_entry, diagnosis_date=None):
+        with self._lock:
+            diagnosis_ordinal, state, _, newest_log, stale = self._cache.get(
+                patient_id, (None, empty_state(), None, None, False)
+            )
+            state, features = update_state(state, log_entry)
+            key = log_key(log_entry)
+            if newest_log is not None and key < newest_log:
+                stale = True
+            else:
+                newest_log = key
+            if diagnosis_date:
+                diagnosis_ordinal = date.fromisoformat(str(diagnosis_date)).toordinal()
+            self._store(patient_id, diagnosis_ordinal, state, features, newest_log, stale)
+        return features
+
+    def rebuild(self, patient_id, logs, diagnosis_date=None):
+        """Recompute a patient's features from their full log history, oldest first."""
+        state, features = empty_state(), np.zeros(FEATURE_SIZE, dtype=np.float32)
+        logs = sorted(logs, key=log_key)
+        for log_entry in logs:
+            state, features = update_state(state, log_entry)
+        diagnosis_ordinal = date.fromisoformat(str(diagnosis_date)).toordinal() if diagnosis_date else None
+        newest_log = log_key(logs[-1]) if logs else None
+        with self._lock:
+            self._store(patient_id, diagnosis_ordinal, state, features, newest_log, False)
+
+    def sync(self, patient_id, logs, diagnosis_date=None):
+        """Rebuild from `logs` when they hold more logs than the store has seen, or it is stale.
+
+        A shorter list is a stale read (cached before the latest save) and never replaces newer features.
+        """
+        count = self.log_count(patient_id)
+        if len(logs) > count or (self.is_stale(patient_id) and len(logs) >= count):
+            self.rebuild(patient_id, logs, diagnosis_date)
+
+    def is_stale(self, patient_id):
+        entry = self._cache.get(patient_id)
+        return bool(entry and entry[4])
+
+    def log_count(self, patient_id):
+        entry = self._cache.get(patient_id)
+        return int(entry[1][0]) if entry else 0
+
+    def vector(self, patient_id, today=None):
+        """Feature vector for `patient_id`, all zeros for patients without logs."""
+        entry = self._cache.get(patient_id)
+        if entry is None:
+            return np.zeros(FEATURE_SIZE, dtype=np.float32)
+        diagnosis_ordinal, _, features, _, _ = entry
+        features = features.copy()
+        if diagnosis_ordinal is not None:
+            features[DAYS_SINCE_DIAGNOSIS] = (today or date.today()).toordinal() - diagnosis_ordinal
+        return features
+
+    def _store(self, patient_id, diagnosis_ordinal, state, features, newest_log, stale):
+        self._cache[patient_id] = (diagnosis_ordinal, state, features, newest_log, stale)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO patient_features "
+                "(patient_id, diagnosis_ordinal, state, features, newest_log, stale) VALUES (?, ?, ?, ?, ?, ?)",
+                (patient_id, diagnosis_ordinal, state.tobytes(), features.tobytes(), newest_log, int(stale))
+            )
+
+
+def combined_input(embedding, features):
+    """Model input for the combined classifier: text embedding followed by structured features."""
+    return np.concatenate([np.asarray(embedding, dtype=np.float32), features]).reshape(1, -1)
+
+
+@st.cache_resource
+def get_feature_store():
+    return FeatureStore(path=st.secrets.get("features", {}).get("STORE_PATH", STORE_PATH))
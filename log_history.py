@@ -0,0 +1,102 @@
+# log_history.py
+import streamlit as st
+
+from app_utils import select_patient_rows
+
+
+PAGE_SIZE = 20
+RECENT_LOGS = 10    # rows in the dashboard's Recent Logs table
+HISTORY_COLUMNS = (
+    "token", "date", "time", "symptoms", "other_symptoms", "medication_taken", "medication_name",
+    "doctor_visited", "doctor_type", "symptom_severity", "sleep_quality", "physical_activity", "mood"
+)
+# Sort key of the history view; must match patient_log_tenant_history_idx in sql/tenant_partitioning.sql
+SORT_KEY = ("date", "time", "token")
+
+
+def _quote(value):
+    return '"{}"'.format(str(value).replace('"', '\\"'))
+
+
+def keyset_condition(row):
+    """PostgREST `or` filter selecting rows that sort strictly after `row` in descending key order."""
+    date, time, token = (_quote(row[k]) for k in SORT_KEY)
+    return (
+        f"date.lt.{date},"
+        f"and(date.eq.{date},time.lt.{time}),"
+        f"and(date.eq.{date},time.eq.{time},token.lt.{token})"
+    )
+
+
+def active_filters(filters):
+    # Unset filters (None, "" or no symptoms) are dropped, so an all-default filter form equals no filters
+    return {key: value for key, value in (filters or {}).items() if value is not None and value not in ("", [])}
+
+
+def apply_filters(query, filters):
+    if filters.get("min_severity") is not None:
+        query = query.gte("symptom_severity", filters["min_severity"])
+    if filters.get("max_severity") is not None:
+        query = query.lte("symptom_severity", filters["max_severity"])
+    for symptom in filters.get("symptoms", ()):
+        query = query.ilike("symptoms", f"%{symptom}%")
+    if filters.get("medication_taken") is not None:
+        query = query.eq("medication_taken", filters["medication_taken"])
+    if filters.get("medication_name"):
+        query = query.ilike("medication_name", f"%{filters['medication_name']}%")
+    if filters.get("doctor_visited") is not None:
+        query = query.eq("doctor_visited", filters["doctor_visited"])
+    return query
+
+
+def fetch_logs_after(client, patient_id, cursor=None, filters=None, limit=PAGE_SIZE, tenant_id=None):
+    """Fetch up to `limit` logs that follow `cursor` (the last row already shown), newest first."""
+    query = select_patient_rows(
+        client, "SUPABASE_PATIENT_LOG_TABLE", patient_id, ", ".join(HISTORY_COLUMNS), tenant_id
+    )
+    query = apply_filters(query, filters or {})
+    if cursor is not None:
+        query = query.or_(keyset_condition(cursor))
+    for column in SORT_KEY:
+        query = query.order(column, desc=True)
+    return query.limit(limit).execute().data
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_recent_logs(_client, patient_id, tenant_id, version=None, limit=RECENT_LOGS):
+    """The newest `limit` logs as one keyset page; `version` as for app_utils.fetch_patient_logs."""
+    return fetch_logs_after(_client, patient_id, limit=limit, tenant_id=tenant_id)
+
+
+class LogHistory:
+    """Pages through one patient's logs, keeping the visible page and the next one loaded."""
+
+    def __init__(self, patient_id, filters=None, page_size=PAGE_SIZE, tenant_id=None):
+        self.patient_id = patient_id
+        self.filters = active_filters(filters)
+        self.page_size = page_size
+        self.tenant_id = tenant_id
+        self.pages = []
+        self.exhausted = False
+
+    def matches(self, patient_id, filters):
+        return self.patient_id == patient_id and self.filters == active_filters(filters)
+
+    def page(self, client, number):
+        self._load(client, number + 2)
+        return self.pages[number] if number < len(self.pages) else []
+
+    def has_next(self, client, number):
+        self._load(client, number + 2)
+        return number + 1 < len(self.pages)
+
+    def _load(self, client, page_count):
+        missing = page_count - len(self.pages)
+        if missing <= 0 or self.exhausted:
+            return
+        cursor = self.pages[-1][-1] if self.pages else None
+        limit = missing * self.page_size
+        rows = fetch_logs_after(client, self.patient_id, cursor, self.filters, limit + 1, self.tenant_id)
+        self.exhausted = len(rows) <= limit
+        rows = rows[:limit]
+        self.pages += [rows[i:i + self.page_size] for i in range(0, len(rows), self.page_size)]
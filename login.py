@@ -2,7 +2,8 @@ import streamlit as st
 import authlib
 import time
 from datetime import datetime, date, timedelta
-from app_utils import create_supabase_client, calculate_age
+from app_utils import create_supabase_client, calculate_age, DEFAULT_TENANT
+from warmup import start_warmup
 
 
 IMAGE_ADDRESS = "https://www.shutterstock.com/image-photo/doctor-healthcare-medicine-patient-talking-600nw-2191880035.jpg"
@@ -21,6 +22,7 @@ def patient_profile_form(patient_id):
             key="dob"
         )
         emergency_contact = st.text_input("Emergency Contact Number", key="emergency_contact")
+        team = st.text_input("Club / Team ID", key="team", help="Leave empty if you are not part of a club")
         condition = st.text_input("Diagnosed Condition", key="condition")
         diagnosis_date = st.date_input(
             "Date of Diagnosis/Incident",
@@ -44,7 +46,8 @@ def patient_profile_form(patient_id):
                 "dob": dob.isoformat(),
                 "emergency_contact": emergency_contact,
                 "condition": condition,
-                "diagnosis_date": diagnosis_date.isoformat()
+                "diagnosis_date": diagnosis_date.isoformat(),
+                "team_id": team.strip().lower() or DEFAULT_TENANT
             }
     return None
 
@@ -80,7 +83,11 @@ def main():
 
         if response.data:
             st.session_state.age = calculate_age(response.data[0]["dob"])
+            st.session_state.patient_emergency_contact = response.data[0]["emergency_contact"]
+            st.session_state.patient_diagnosis_date = response.data[0]["diagnosis_date"]
+            st.session_state.team_id = response.data[0].get("team_id") or DEFAULT_TENANT
             st.session_state.user_profile = True
+            start_warmup()
             st.subheader(f"Welcome {st.user.name}")
             st.info("Proceed to Daily Log. Also if you want check for Concussion go to Concussion Classification page")
         else:
@@ -94,6 +101,9 @@ def main():
 
                     if response.data:
                         st.session_state.age = calculate_age(response.data[0]["dob"])
+                        st.session_state.patient_emergency_contact = response.data[0]["emergency_contact"]
+                        st.session_state.patient_diagnosis_date = response.data[0]["diagnosis_date"]
+                        st.session_state.team_id = response.data[0]["team_id"]
                         st.session_state.user_profile = True
                         st.success("Profile saved successfully!")
                         st.balloons()
@@ -0,0 +1,264 @@
+# notes_search.py
+import hashlib
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import streamlit as st
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_PATH = "notes_index.db"
+EMBEDDING_DIMENSIONS = 256
+NOTE_FIELDS = ("other_symptoms", "doctor_notes")
+SCHEMA_VERSION = 2      # 2: patient_key column in notes_fts
+VECTOR_CHUNK = 10_000   # vectors scored per step when searching all notes
+
+
+def note_text(log_entry):
+    return "\n".join(str(log_entry.get(f) or "").strip() for f in NOTE_FIELDS).strip()
+
+
+def patient_key(patient_id):
+    # Patient ids aren't single FTS tokens (uuids split on "-"), so each gets a hex key instead
+    return "p" + hashlib.sha1(patient_id.encode()).hexdigest()
+
+
+def fts_query(text, patient_ids=None):
+    # Quote every term so user input can't be parsed as FTS5 syntax; terms are ANDed and only
+    # match the note columns. With `patient_ids`, the patient filter is part of the MATCH too.
+    terms = [t.replace('"', '""') for t in text.split()]
+    if not terms:
+        return ""
+    query = "{%s} : (%s)" % (" ".join(NOTE_FIELDS), " ".join(f'"{t}"' for t in terms))
+    if patient_ids is not None:
+        keys = " OR ".join(patient_key(p) for p in patient_ids)
+        query = f"patient_key : ({keys}) AND {query}"
+    return query
+
+
+class NotesIndex:
+    """Keyword (SQLite FTS5) and semantic (embedding) index over free-text log notes.
+
+    Note vectors stay in SQLite (1 KiB each at 256 dimensions) and are read per query, so a
+    server process holds none of them in memory.
+    """
+
+    def __init__(self, path=INDEX_PATH, embed=None, dimensions=EMBEDDING_DIMENSIONS):
+        self.embed = embed
+        self.dimensions = dimensions
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notes-embed")
+        self._pending = set()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS notes (
+                id INTEGER PRIMARY KEY,
+                token TEXT UNIQUE NOT NULL,
+                patient_id TEXT NOT NULL,
+                date TEXT,
+                other_symptoms TEXT,
+                doctor_notes TEXT,
+                patient_key TEXT
+            );
+            CREATE INDEX IF NOT EXISTS notes_patient_idx ON notes (patient_id);
+            CREATE TABLE IF NOT EXISTS note_vectors (
+                id INTEGER PRIMARY KEY REFERENCES notes (id),
+                vector BLOB NOT NULL
+            );
+        """)
+        self._migrate()
+
+    def _migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self._lock, self.conn:
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(notes)")}
+            if "patient_key" not in columns:
+                self.conn.execute("ALTER TABLE notes ADD COLUMN patient_key TEXT")
+            self.conn.create_function("patient_key", 1, patient_key, deterministic=True)
+            self.conn.execute("UPDATE notes SET patient_key = patient_key(patient_id) WHERE patient_key IS NULL")
+            # The FTS table is derived from notes, so it is recreated rather than altered
+            self.conn.execute("DROP TABLE IF EXISTS notes_fts")
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE notes_fts USING fts5 ("
+                "other_symptoms, doctor_notes, patient_key, content='notes', content_rowid='id')"
+            )
+            self.conn.execute("INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def add(self, log_entry, vector=None):
+        """Index one log's notes. Returns the note id, or None if it had no text or was already indexed."""
+        return self.add_many([log_entry], None if vector is None else [vector])[0]
+
+    def add_many(self, log_entries, vectors=None):
+        """Index a batch of logs in a single transaction."""
+        note_ids = []
+        with self._lock, self.conn:
+            for i, log_entry in enumerate(log_entries):
+                note_id = self._insert(log_entry)
+                note_ids.append(note_id)
+                if note_id is not None and vectors is not None:
+                    self._insert_vector(note_id, vectors[i])
+        return note_ids
+
+    def add_vector(self, note_id, vector):
+        with self._lock, self.conn:
+            self._insert_vector(note_id, vector)
+
+    def _insert(self, log_entry):
+        if not note_text(log_entry):
+            return None
+        other_symptoms = log_entry.get("other_symptoms") or ""
+        doctor_notes = log_entry.get("doctor_notes") or ""
+        key = patient_key(log_entry["patient_id"])
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO notes (token, patient_id, date, other_symptoms, doctor_notes, patient_key) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (log_entry["token"], log_entry["patient_id"], log_entry.get("date"), other_symptoms, doctor_notes, key)
+        )
+        if not cursor.rowcount:
+            return None
+        note_id = cursor.lastrowid
+        self.conn.execute(
+            "INSERT INTO notes_fts (rowid, other_symptoms, doctor_notes, patient_key) VALUES (?, ?, ?, ?)",
+            (note_id, other_symptoms, doctor_notes, key)
+        )
+        return note_id
+
+    def _insert_vector(self, note_id, vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        self.conn.execute(
+            "INSERT OR REPLACE INTO note_vectors (id, vector) VALUES (?, ?)", (note_id, vector.tobytes())
+        )
+
+    def add_async(self, log_entry):
+        # Keyword indexing is immediate; the embedding call runs off the caller's thread
+        note_id = self.add(log_entry)
+        if note_id is not None:
+            self._embed_async(note_id, log_entry)
+        return note_id
+
+    def _embed_async(self, note_id, log_entry):
+        with self._lock:
+            if self.embed is None or note_id in self._pending:
+                return
+            self._pending.add(note_id)
+        future = self._executor.submit(self._embed_note, note_id, log_entry)
+        future.add_done_callback(lambda f: self._embed_done(note_id, f))
+
+    def _embed_done(self, note_id, future):
+        with self._lock:
+            self._pending.discard(note_id)
+        if future.exception() is not None:
+            logger.error("Embedding note %s failed; it will be retried on the next sync", note_id,
+                         exc_info=future.exception())
+
+    def _embed_note(self, note_id, log_entry):
+        self.add_vector(note_id, self.embed(note_text(log_entry)))
+
+    def sync(self, log_entries):
+        """Index logs missing from the index and retry embeddings that never completed."""
+        by_patient = {}
+        for entry in log_entries:
+            by_patient.setdefault(entry["patient_id"], []).append(entry)
+        for patient_id, entries in by_patient.items():
+            with self._lock:
+                indexed = dict(self.conn.execute(
+                    "SELECT token, id FROM notes WHERE patient_id = ?", (patient_id,)
+                ))
+                missing_vectors = {row[0] for row in self.conn.execute(
+                    "SELECT n.id FROM notes n LEFT JOIN note_vectors v ON v.id = n.id "
+                    "WHERE n.patient_id = ? AND v.id IS NULL", (patient_id,)
+                )}
+            for entry in entries:
+                note_id = indexed.get(entry["token"])
+                if note_id is None:
+                    self.add_async(entry)
+                elif note_id in missing_vectors:
+                    self._embed_async(note_id, entry)
+
+    def keyword_search(self, text, patient_ids=None, limit=20):
+        """Notes containing every term, most recently indexed first.
+
+        Results are not ranked with bm25(): it scores every matching note in the index, which
+        dominated query time at a million notes. Semantic search covers relevance ranking.
+        """
+        if patient_ids is not None:
+            patient_ids = list(patient_ids)
+            if not patient_ids:
+                return []
+        # The patient filter is resolved inside FTS5 by intersecting doclists, so only the
+        # patients' matching notes are visited, newest rowid first
+        query = fts_query(text, patient_ids)
+        if not query:
+            return []
+        with self._lock:
+            return self._rows(self.conn.execute(
+                "SELECT n.token, n.patient_id, n.date, n.other_symptoms, n.doctor_notes, NULL "
+                "FROM notes_fts JOIN notes n ON n.id = notes_fts.rowid "
+                "WHERE notes_fts MATCH ? ORDER BY notes_fts.rowid DESC LIMIT ?",
+                (query, limit)
+            ))
+
+    def semantic_search(self, text, patient_ids=None, limit=20, vector=None):
+        """Notes closest in meaning to `text` (or its embedding `vector`), best first.
+
+        A patient's or cohort's vectors are read through notes_patient_idx. Searching all notes
+        scans note_vectors in VECTOR_CHUNK steps, keeping only the running top `limit`.
+        """
+        if vector is None:
+            vector = self.embed(text)
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        if patient_ids is None:
+            sql, params = "SELECT id, vector FROM note_vectors", []
+        else:
+            params = list(patient_ids)
+            if not params:
+                return []
+            sql = (
+                "SELECT v.id, v.vector FROM notes n CROSS JOIN note_vectors v "
+                f"WHERE n.patient_id IN ({', '.join('?' * len(params))}) AND v.id = n.id"
+            )
+        ids, scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+            while rows := cursor.fetchmany(VECTOR_CHUNK):
+                matrix = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32)
+                ids = np.concatenate([ids, np.fromiter((row[0] for row in rows), np.int64, len(rows))])
+                scores = np.concatenate([scores, matrix.reshape(len(rows), -1) @ query])
+                if len(scores) > limit:
+                    top = np.argpartition(-scores, limit - 1)[:limit]
+                    ids, scores = ids[top], scores[top]
+            if not len(ids):
+                return []
+            order = np.argsort(-scores)
+            ids, scores = ids[order].tolist(), scores[order].tolist()
+            by_id = {row[0]: row[1:] for row in self.conn.execute(
+                f"SELECT id, token, patient_id, date, other_symptoms, doctor_notes FROM notes "
+                f"WHERE id IN ({', '.join('?' * len(ids))})", ids
+            )}
+        return self._rows((*by_id[i], score) for i, score in zip(ids, scores))
+
+    @staticmethod
+    def _rows(rows):
+        keys = ("token", "patient_id", "date", "other_symptoms", "doctor_notes", "score")
+        return [dict(zip(keys, row)) for row in rows]
+
+
+@st.cache_resource
+def get_notes_index():
+    from embeddings import get_openai_embeddings
+    path = st.secrets.get("search", {}).get("INDEX_PATH", INDEX_PATH)
+    return NotesIndex(path=path, embed=get_openai_embeddings)
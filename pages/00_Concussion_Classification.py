@@ -3,7 +3,10 @@ import streamlit as st
 import pandas as pd
 from datetime import date
 import numpy as np
-import pickle
+import os
+from app_utils import load_model, MODEL_NAME, COMBINED_MODEL_NAME
+from feature_store import get_feature_store, combined_input
+from warmup import record_first_visit
 
 
 if not st.user.is_logged_in:
@@ -15,16 +18,11 @@ if not st.session_state.user_profile == True:
     st.stop()
 
 
-MODEL_NAME = "balanced_MLP_best_model"
+record_first_visit("classification")
 
-
-@st.cache_resource
-def load_model(model_name):
-    with open(model_name, "rb") as file_name:
-        return pickle.load(file_name)
-
-# Load the model
+# Load the model (usually already cached by the login warm-up)
 tabular_model = load_model(MODEL_NAME)
+combined_model = load_model(COMBINED_MODEL_NAME) if os.path.exists(COMBINED_MODEL_NAME) else None
 
 # Title
 st.title("Soccer Concussion Classification")
@@ -78,11 +76,14 @@ if st.button("Apply"):
         # Generate embeddings
         embeddings = get_openai_embeddings(text)
 
-        # Ensure the embeddings are in 2D shape for the model
-        embedding_array = np.array(embeddings).reshape(1, -1)
-
-        # Make prediction
-        index = tabular_model.predict(embedding_array)
+        # Make prediction, adding the patient's log features when a combined model is available
+        if combined_model is not None:
+            features = get_feature_store().vector(st.session_state['patient_id'])
+            index = combined_model.predict(combined_input(embeddings, features))
+        else:
+            # Ensure the embeddings are in 2D shape for the model
+            embedding_array = np.array(embeddings).reshape(1, -1)
+            index = tabular_model.predict(embedding_array)
         labels = ['Concussion', 'No Concussion']
         injury_status = labels[index[0]]
 
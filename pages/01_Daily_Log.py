@@ -4,7 +4,11 @@ import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import uuid
-from app_utils import create_supabase_client
+from app_utils import create_supabase_client, current_tenant, fetch_patient_logs, get_log_versions, tenant_table, SYMPTOMS
+from alerts import get_alert_pipeline, alert_contacts
+from notes_search import get_notes_index
+from feature_store import get_feature_store
+from warmup import record_first_visit
 
 
 if not st.user.is_logged_in:
@@ -15,12 +19,8 @@ if not st.session_state.user_profile == True:
     st.error("Please finish setting up the profile")
     st.stop()
 
+record_first_visit("daily_log")
 
-SYMPTOMS = [
-    "Headache", "Dizziness", "Nausea", "Fatigue", "Blurred vision",
-    "Trouble concentrating", "Trouble sleeping", "Irritability",
-    "Sensitivity to light", "Sensitivity to noise", "Memory problems"
-]
 
 # Doctor types
 DOCTOR_TYPES = [
@@ -129,6 +129,7 @@ if submitted:
     log_entry = {
         'token': str(uuid.uuid4()),
         'patient_id': st.session_state['patient_id'],
+        'team_id': current_tenant(),
         'date': log_date.isoformat(),
         'time': log_time.strftime("%H:%M"),
         'symptoms': ", ".join(selected_symptoms),
@@ -147,5 +148,17 @@ if submitted:
 
     client = create_supabase_client()
 
-    client.table(st.secrets["supabase"]["SUPABASE_PATIENT_LOG_TABLE"]).insert(log_entry).execute()
+    tenant_table(client, "SUPABASE_PATIENT_LOG_TABLE").insert(log_entry).execute()
+    get_log_versions().bump(log_entry['patient_id'])
+    get_alert_pipeline().submit(log_entry, alert_contacts())
+    get_notes_index().add_async(log_entry)
+    feature_store = get_feature_store()
+    feature_store.update(log_entry['patient_id'], log_entry, st.session_state.get('patient_diagnosis_date'))
+    if feature_store.is_stale(log_entry['patient_id']):
+        # A backdated log can't be folded in as the newest one; replay the full history instead
+        logs = fetch_patient_logs(
+            client, log_entry['patient_id'], current_tenant(), get_log_versions().get(log_entry['patient_id'])
+        )
+        feature_store.sync(log_entry['patient_id'], logs, st.session_state.get('patient_diagnosis_date'))
+    st.session_state.pop("log_history", None)
     st.success("Your Information is submitted")
\ No newline at end of file
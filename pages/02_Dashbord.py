@@ -4,7 +4,13 @@ from datetime import datetime
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from app_utils import create_supabase_client
+from app_utils import create_supabase_client, current_tenant, fetch_patient_logs, get_log_versions, select_patient_rows
+from log_history import fetch_recent_logs
+from notes_search import get_notes_index
+from embeddings import get_query_embedding
+from reports import REPORT_FORMATS, get_report_workers
+from feature_store import get_feature_store
+from warmup import record_first_visit
 
 
 
@@ -16,20 +22,24 @@ if not st.session_state.user_profile == True:
     st.error("Please finish setting up the profile")
     st.stop()
 
+record_first_visit("dashboard")
+
 st.title("📊 Recovery Dashboard")
 
 
 # Load logs
 client = create_supabase_client()
-log_info = client.table(st.secrets["supabase"]["SUPABASE_PATIENT_LOG_TABLE"]).select("*").eq("patient_id", st.session_state['patient_id']).execute()
+log_data = fetch_patient_logs(
+    client, st.session_state['patient_id'], current_tenant(), get_log_versions().get(st.session_state['patient_id'])
+)
 
 
-if not log_info.data:
+if not log_data:
     st.info("No logs available yet. Please complete a daily log entry first.")
     st.stop()
 
 else:
-    logs = pd.DataFrame(log_info.data)
+    logs = pd.DataFrame(log_data)
     
     # Ensure date column is in datetime format
     if 'date' in logs.columns:
@@ -38,6 +48,9 @@ else:
     # Remove any rows with invalid dates
     logs = logs.dropna(subset=['date'])
 
+    # Keep the classifier's structured features in step with the full history
+    get_feature_store().sync(st.session_state['patient_id'], log_data, st.session_state.get('patient_diagnosis_date'))
+
 
     # Summary stats
     st.subheader("Recovery Overview")
@@ -83,16 +96,20 @@ else:
         )
         st.plotly_chart(fig, use_container_width=True)
 
-    # Show recent logs
+    # Show recent logs: one keyset page, newest first, rather than sorting the full history
     st.subheader("Recent Logs")
-    if not logs.empty:
+    recent_logs = pd.DataFrame(fetch_recent_logs(
+        client, st.session_state['patient_id'], current_tenant(), get_log_versions().get(st.session_state['patient_id'])
+    ))
+    if not recent_logs.empty:
+        recent_logs['date'] = pd.to_datetime(recent_logs['date'], errors='coerce')
         # Select and format columns for display
         display_cols = ['date', 'symptom_severity', 'mood', 'sleep_quality', 'medication_taken']
-        display_cols = [col for col in display_cols if col in logs.columns]
+        display_cols = [col for col in display_cols if col in recent_logs.columns]
         
         if display_cols:
             st.dataframe(
-                logs[display_cols].sort_values('date', ascending=False).head(10),
+                recent_logs[display_cols],
                 column_config={
                     'date': st.column_config.DateColumn("Date"),
                     'symptom_severity': st.column_config.NumberColumn(
@@ -107,5 +124,76 @@ else:
                 hide_index=True,
                 use_container_width=True
             )
-
-
+        st.page_link("pages/05_Log_History.py", label="Browse full log history", icon="🗂️")
+
+    # Clinician report
+    st.subheader("Clinician Report")
+
+    def report_status(path, polling):
+        job = get_report_workers().job(path) if path else None
+        if job is None:
+            return
+        if not job.done():
+            st.info("Generating report...")
+        elif polling:
+            # Rerun the whole page once so the fragment stops polling
+            st.rerun()
+        elif job.exception() is not None:
+            st.error(f"Report generation failed: {job.exception()}")
+        else:
+            with open(path, "rb") as report_file:
+                st.download_button(
+                    "Download report",
+                    data=report_file,
+                    file_name=f"recovery_report.{path.rsplit('.', 1)[-1]}",
+                    icon=":material/download:"
+                )
+
+    report_format = st.radio("Format", REPORT_FORMATS, format_func=str.upper, horizontal=True)
+    if st.button("Generate report"):
+        profile = select_patient_rows(client, "SUPABASE_TABLE", st.session_state['patient_id']).execute()
+        st.session_state.report_path = get_report_workers().submit(profile.data[0], log_data, report_format)
+    report_path = st.session_state.get("report_path")
+    report_job = get_report_workers().job(report_path) if report_path else None
+    polling = report_job is not None and not report_job.done()
+    st.fragment(report_status, run_every="2s" if polling else None)(report_path, polling)
+
+    # Notes search
+    st.subheader("Notes")
+    notes_index = get_notes_index()
+    notes_index.sync(log_data)
+
+    search_col, mode_col = st.columns([3, 1])
+    with search_col:
+        notes_query = st.text_input("Search your notes and other symptoms")
+    with mode_col:
+        search_mode = st.radio("Search type", ["Keyword", "Semantic"], horizontal=True)
+
+    if notes_query:
+        if search_mode == "Keyword":
+            matches = notes_index.keyword_search(notes_query, patient_ids=[st.session_state['patient_id']])
+        else:
+            matches = notes_index.semantic_search(
+                notes_query, patient_ids=[st.session_state['patient_id']], vector=get_query_embedding(notes_query)
+            )
+        notes = pd.DataFrame(matches)
+        if not notes.empty:
+            notes['date'] = pd.to_datetime(notes['date'], errors='coerce')
+    else:
+        note_cols = [col for col in ['date', 'other_symptoms', 'doctor_notes'] if col in logs.columns]
+        notes = logs[note_cols].sort_values('date', ascending=False) if note_cols else pd.DataFrame()
+        notes = notes[(notes.drop(columns='date', errors='ignore').fillna('') != '').any(axis=1)]
+
+    if notes.empty:
+        st.info("No matching notes.")
+    else:
+        st.dataframe(
+            notes[[col for col in ['date', 'other_symptoms', 'doctor_notes'] if col in notes.columns]],
+            column_config={
+                'date': st.column_config.DateColumn("Date"),
+                'other_symptoms': "Other Symptoms",
+                'doctor_notes': "Doctor Notes"
+            },
+            hide_index=True,
+            use_container_width=True
+        )
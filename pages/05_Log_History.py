@@ -0,0 +1,102 @@
+import streamlit as st
+import pandas as pd
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app_utils import create_supabase_client, SYMPTOMS
+from log_history import LogHistory
+from warmup import prefetched_log_history, record_first_visit
+
+
+if not st.user.is_logged_in:
+    st.error("Please log in to access the App")
+    st.stop()
+
+if not st.session_state.user_profile == True:
+    st.error("Please finish setting up the profile")
+    st.stop()
+
+record_first_visit("log_history")
+
+
+yes_no_mapping = {"Any": None, "Yes": True, "No": False}
+
+
+st.title("🗂️ Log History")
+
+# Filters
+with st.expander("Filters"):
+    min_severity, max_severity = st.slider("Symptom severity", 1, 10, (1, 10))
+    symptoms = st.multiselect("Symptoms", SYMPTOMS)
+    col1, col2 = st.columns(2)
+    with col1:
+        medication_taken = st.radio("Medication taken", list(yes_no_mapping), horizontal=True)
+        medication_name = st.text_input("Medication name contains")
+    with col2:
+        doctor_visited = st.radio("Doctor visited", list(yes_no_mapping), horizontal=True)
+
+filters = {
+    "min_severity": min_severity if min_severity > 1 else None,
+    "max_severity": max_severity if max_severity < 10 else None,
+    "symptoms": symptoms,
+    "medication_taken": yes_no_mapping[medication_taken],
+    "medication_name": medication_name.strip(),
+    "doctor_visited": yes_no_mapping[doctor_visited]
+}
+
+# Restart paging whenever the patient or the filters change
+history = st.session_state.get("log_history")
+if history is None:
+    # First visit: start from the unfiltered pages the login warm-up prefetched, when they are ready
+    history = prefetched_log_history()
+    st.session_state.log_history_page = 0
+if history is None or not history.matches(st.session_state['patient_id'], filters):
+    history = LogHistory(st.session_state['patient_id'], filters)
+    st.session_state.log_history_page = 0
+st.session_state.log_history = history
+
+client = create_supabase_client()
+page_number = st.session_state.log_history_page
+rows = history.page(client, page_number)
+
+if not rows:
+    st.info("No logs match these filters." if page_number == 0 else "No more logs.")
+else:
+    logs = pd.DataFrame(rows)
+    logs['date'] = pd.to_datetime(logs['date'], errors='coerce')
+    st.dataframe(
+        logs.drop(columns=['token']),
+        column_config={
+            'date': st.column_config.DateColumn("Date"),
+            'time': "Time",
+            'symptoms': "Symptoms",
+            'other_symptoms': "Other Symptoms",
+            'medication_taken': "Medication Taken",
+            'medication_name': "Medication",
+            'doctor_visited': "Doctor Visited",
+            'doctor_type': "Doctor",
+            'symptom_severity': st.column_config.NumberColumn(
+                "Severity (1-10)",
+                format="%d",
+                help="1 = Very mild, 10 = Extremely severe"
+            ),
+            'sleep_quality': "Sleep Quality",
+            'physical_activity': "Physical Activity",
+            'mood': "Mood"
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+
+# Pagination
+col1, col2, col3 = st.columns([1, 2, 1])
+with col1:
+    if st.button("← Newer", disabled=page_number == 0):
+        st.session_state.log_history_page -= 1
+        st.rerun()
+with col2:
+    st.caption(f"Page {page_number + 1}")
+with col3:
+    if st.button("Older →", disabled=not history.has_next(client, page_number)):
+        st.session_state.log_history_page += 1
+        st.rerun()
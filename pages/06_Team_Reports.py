@@ -0,0 +1,59 @@
+import streamlit as st
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app_utils import create_supabase_client, current_tenant, is_team_staff
+from reports import REPORT_FORMATS, get_report_workers
+
+
+if not st.user.is_logged_in:
+    st.error("Please log in to access the App")
+    st.stop()
+
+if not st.session_state.user_profile == True:
+    st.error("Please finish setting up the profile")
+    st.stop()
+
+if not is_team_staff():
+    st.error("Team reports are only available to your team's staff")
+    st.stop()
+
+
+st.title("🏟️ Team Reports")
+st.write(f"Export a report for every patient in team **{current_tenant()}**.")
+
+
+def export_status(path, polling):
+    job = get_report_workers().job(path) if path else None
+    if job is None:
+        return
+    if not job.done():
+        st.info("Rendering team reports...")
+    elif polling:
+        # Rerun the whole page once so the fragment stops polling
+        st.rerun()
+    elif job.exception() is not None:
+        st.error(f"Team export failed: {job.exception()}")
+    else:
+        archive, failed = job.result()
+        if failed:
+            st.warning(f"{len(failed)} report(s) could not be rendered and are missing from the archive: "
+                       f"{', '.join(failed)}")
+        with open(archive, "rb") as archive_file:
+            st.download_button(
+                "Download team reports",
+                data=archive_file,
+                file_name=f"{current_tenant()}_reports.zip",
+                icon=":material/download:"
+            )
+
+
+export_format = st.radio("Format", REPORT_FORMATS, format_func=str.upper, horizontal=True)
+if st.button("Export team reports"):
+    st.session_state.team_export_path = get_report_workers().submit_team_export(
+        create_supabase_client(), current_tenant(), export_format
+    )
+export_path = st.session_state.get("team_export_path")
+export_job = get_report_workers().job(export_path) if export_path else None
+polling = export_job is not None and not export_job.done()
+st.fragment(export_status, run_every="2s" if polling else None)(export_path, polling)
@@ -0,0 +1,38 @@
+import streamlit as st
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from app_utils import is_operator
+from warmup import get_warmup_stats
+
+
+if not st.user.is_logged_in:
+    st.error("Please log in to access the App")
+    st.stop()
+
+if not is_operator():
+    st.error("This page is only available to operators")
+    st.stop()
+
+
+st.title("🛠️ Operations")
+
+# Login warm-up: how often it finished before the session's first page visit
+st.subheader("Login Warm-up")
+stats = get_warmup_stats().snapshot()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Started", stats["started"])
+col2.metric("Failed", stats["failed"])
+col3.metric("Hit rate", "–" if stats["hit_rate"] is None else f"{stats['hit_rate']:.0%}")
+col4.metric("First visits", stats["first_visits"])
+col1, col2 = st.columns(2)
+col1.metric(
+    "Median lead (s)", "–" if stats["median_lead_seconds"] is None else stats["median_lead_seconds"],
+    help="How long before the first page visit the warm-up finished, when it won"
+)
+col2.metric(
+    "Median lag (s)", "–" if stats["median_lag_seconds"] is None else stats["median_lag_seconds"],
+    help="How long after the first page visit the warm-up finished, when it lost"
+)
+if st.button("Refresh"):
+    st.rerun()
@@ -0,0 +1,233 @@
+# reports.py
+import io
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+from fpdf import FPDF
+
+from app_utils import tenant_table
+
+
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = "report_cache"
+REPORT_FORMATS = ("pdf", "csv")
+REPORT_MAX_AGE = 24 * 3600      # seconds a rendered report or bulk archive is kept in REPORT_DIR
+# Rows per request when reading a whole team; PostgREST truncates responses at max_rows (1000 by default)
+TEAM_PAGE_SIZE = 1000
+PROFILE_FIELDS = {
+    "patient_name": "Name",
+    "dob": "Date of Birth",
+    "condition": "Diagnosed Condition",
+    "diagnosis_date": "Date of Diagnosis/Incident",
+    "emergency_contact": "Emergency Contact"
+}
+LOG_COLUMNS = {
+    "date": "Date",
+    "time": "Time",
+    "symptom_severity": "Severity",
+    "symptoms": "Symptoms",
+    "mood": "Mood",
+    "sleep_quality": "Sleep",
+    "medication_name": "Medication",
+    "doctor_type": "Doctor"
+}
+
+
+def report_path(patient_id, logs, fmt, report_dir=REPORT_DIR):
+    # A report only changes when a new log arrives, so the newest log timestamp versions it
+    last_logged = max((str(log.get("logged_at") or "") for log in logs), default="none")
+    key = uuid.uuid5(uuid.NAMESPACE_URL, f"{patient_id}|{last_logged}")
+    return os.path.join(report_dir, f"{key}.{fmt}")
+
+
+def logs_frame(logs):
+    frame = pd.DataFrame(logs)
+    if frame.empty:
+        return pd.DataFrame(columns=list(LOG_COLUMNS)).astype({"date": "datetime64[ns]"})
+    frame["date"] = pd.to_datetime(frame["date"], errors="coerce")
+    return frame.dropna(subset=["date"]).sort_values(["date", "time"]).reset_index(drop=True)
+
+
+def report_figures(frame):
+    figures = []
+    if not frame.empty:
+        figures.append(px.line(frame, x="date", y="symptom_severity", title="Symptom Severity Over Time"))
+        symptoms = frame["symptoms"].dropna().str.split(",").explode().str.strip()
+        counts = symptoms[symptoms != ""].value_counts()
+        if not counts.empty:
+            figures.append(px.bar(x=counts.index, y=counts.values, labels={"x": "Symptom", "y": "Count"},
+                                  title="Symptom Frequency"))
+    return figures
+
+
+def _latin1(value):
+    # Core PDF fonts only cover latin-1
+    return str("" if value is None else value).encode("latin-1", "replace").decode("latin-1")
+
+
+def render_pdf(profile, frame):
+    pdf = FPDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Helvetica", style="B", size=16)
+    pdf.cell(0, 10, "Recovery Report", new_x="LMARGIN", new_y="NEXT")
+
+    pdf.set_font("Helvetica", size=10)
+    for field, label in PROFILE_FIELDS.items():
+        pdf.cell(0, 6, _latin1(f"{label}: {profile.get(field, '')}"), new_x="LMARGIN", new_y="NEXT")
+    if not frame.empty:
+        pdf.cell(0, 6, f"Days Logged: {len(frame)}", new_x="LMARGIN", new_y="NEXT")
+        pdf.cell(0, 6, f"Average Symptom Severity: {frame['symptom_severity'].mean():.1f}/10",
+                 new_x="LMARGIN", new_y="NEXT")
+
+    for fig in report_figures(frame):
+        pdf.image(io.BytesIO(fig.to_image(format="png", width=900, height=450)), w=pdf.epw)
+
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=8)
+    columns = [c for c in LOG_COLUMNS if c in frame.columns]
+    with pdf.table() as table:
+        table.row([LOG_COLUMNS[c] for c in columns])
+        for _, log in frame.iterrows():
+            table.row([_latin1(log[c].date() if c == "date" else log[c]) for c in columns])
+    return bytes(pdf.output())
+
+
+def render_csv(profile, frame):
+    frame = frame.copy()
+    frame.insert(0, "patient_name", profile.get("patient_name", ""))
+    frame["date"] = frame["date"].dt.date
+    return frame.to_csv(index=False).encode("utf-8")
+
+
+def render_report(profile, logs, fmt, path):
+    """Render one report to `path`. Runs in a worker process."""
+    if os.path.exists(path):
+        return path
+    frame = logs_frame(logs)
+    data = render_pdf(profile, frame) if fmt == "pdf" else render_csv(profile, frame)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def fetch_all(build_query, page_size=TEAM_PAGE_SIZE):
+    """Every row of `build_query()`, read `page_size` rows at a time. The query must have a total order."""
+    rows = []
+    while True:
+        page = build_query().range(len(rows), len(rows) + page_size - 1).execute().data
+        rows += page
+        if len(page) < page_size:
+            return rows
+
+
+def fetch_team_patients(client, tenant_id, page_size=TEAM_PAGE_SIZE):
+    """(profile, logs) pairs for every patient of a team, read from the team's partition."""
+    profiles = fetch_all(
+        lambda: tenant_table(client, "SUPABASE_TABLE", tenant_id)
+        .select("*").eq("team_id", tenant_id).order("patient_id"),
+        page_size
+    )
+    logs = fetch_all(
+        lambda: tenant_table(client, "SUPABASE_PATIENT_LOG_TABLE", tenant_id)
+        .select("*").eq("team_id", tenant_id).order("patient_id").order("token"),
+        page_size
+    )
+    logs_by_patient = {}
+    for log in logs:
+        logs_by_patient.setdefault(log["patient_id"], []).append(log)
+    return [(profile, logs_by_patient.get(profile["patient_id"], [])) for profile in profiles]
+
+
+class ReportWorkers:
+    """Process pool that renders reports off the Streamlit request thread."""
+
+    def __init__(self, max_workers=None, report_dir=REPORT_DIR, max_age=REPORT_MAX_AGE):
+        self.report_dir = report_dir
+        self.max_age = max_age
+        # Spawned rather than forked workers: the server process runs threads (sessions, alert and
+        # embedding workers) whose locks a forked child could inherit mid-acquire
+        self.pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+        # Bulk exports read the database and wait on renders, so they get threads of their own
+        self.exports = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-export")
+        self.jobs = {}
+        self.pruned_at = 0
+        self.prune()
+
+    def submit(self, profile, logs, fmt):
+        self.prune()
+        path = report_path(profile["patient_id"], logs, fmt, self.report_dir)
+        job = self.jobs.get(path)
+        if job is None or (job.done() and job.exception() is not None):
+            job = self.pool.submit(render_report, profile, logs, fmt, path)
+            self.jobs[path] = job
+        return path
+
+    def job(self, path):
+        return self.jobs.get(path)
+
+    def prune(self):
+        """Delete reports and archives older than `max_age`, at most once per tenth of it."""
+        now = time.time()
+        if now - self.pruned_at < self.max_age / 10 or not os.path.isdir(self.report_dir):
+            return
+        self.pruned_at = now
+        for name in os.listdir(self.report_dir):
+            path = os.path.join(self.report_dir, name)
+            job = self.jobs.get(path)
+            if job is not None and not job.done():
+                continue
+            try:
+                if now - os.path.getmtime(path) > self.max_age:
+                    os.remove(path)
+                    self.jobs.pop(path, None)
+            except FileNotFoundError:
+                pass
+
+    def export_bulk(self, patients, fmt, archive=None):
+        """Render reports for many (profile, logs) pairs in parallel and bundle them in a zip archive.
+
+        Returns (archive, failed patient ids); a report that fails to render is left out of the archive.
+        """
+        paths = [(profile, self.submit(profile, logs, fmt)) for profile, logs in patients]
+        os.makedirs(self.report_dir, exist_ok=True)
+        archive = archive or os.path.join(self.report_dir, f"bulk-{uuid.uuid4()}.zip")
+        failed = []
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as bundle:
+            for profile, path in paths:
+                try:
+                    self.jobs[path].result()
+                except Exception:
+                    logger.exception("Report for %s failed; leaving it out of %s", profile["patient_id"], archive)
+                    failed.append(profile["patient_id"])
+                    continue
+                bundle.write(path, f"{profile['patient_id']}.{fmt}")
+        return archive, failed
+
+    def export_team(self, client, tenant_id, fmt, archive=None):
+        """Zip archive with one report per patient of the team, as returned by export_bulk."""
+        return self.export_bulk(fetch_team_patients(client, tenant_id), fmt, archive)
+
+    def submit_team_export(self, client, tenant_id, fmt):
+        """Start export_team in the background and return the archive path; poll it with job()."""
+        self.prune()
+        archive = os.path.join(self.report_dir, f"bulk-{uuid.uuid4()}.zip")
+        self.jobs[archive] = self.exports.submit(self.export_team, client, tenant_id, fmt, archive)
+        return archive
+
+
+@st.cache_resource
+def get_report_workers():
+    return ReportWorkers()
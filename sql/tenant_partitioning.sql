@@ -0,0 +1,172 @@
+-- Multi-tenant layout for profiles and logs.
+-- Replace patient_profile / patient_log with the configured SUPABASE_TABLE /
+-- SUPABASE_PATIENT_LOG_TABLE names before running.
+--
+-- Both tables are hash partitioned on (team_id, patient_id). Hashing on team_id
+-- alone would put every patient without a team in the 'default' partition;
+-- adding patient_id spreads them, and every per-patient query filters on both
+-- columns, so it is still pruned to a single partition. Team-wide reads (team
+-- report exports) scan all partitions through the (team_id, ...) index. Clubs
+-- large enough to need their own table get one (see the example at the end)
+-- and are routed to it from secrets:
+--
+--   [tenants.<team_id>]
+--   SUPABASE_PATIENT_LOG_TABLE = "patient_log_<team_id>"
+--
+-- The new tables copy the old ones with `like ... including all excluding
+-- indexes`, so identity columns, generated columns and constraints carry over.
+-- Identity columns on partitioned tables need PostgreSQL 17 or later. The old
+-- row-level security policies are re-created on the new tables. Row-level
+-- security is enabled on every new table and partition, so PostgREST can't read
+-- a partition directly and bypass the parent's policies.
+
+begin;
+
+-- Patient directory ------------------------------------------------------
+
+-- A unique constraint on a partitioned table has to include the partition key,
+-- so "one profile per patient across all teams" is enforced here instead, and
+-- it is the patient_id lookup login needs before the team is known.
+create table patient_directory (
+    patient_id text primary key,
+    team_id text not null,
+    unique (patient_id, team_id)
+);
+alter table patient_directory enable row level security;
+
+-- Profiles ---------------------------------------------------------------
+
+alter table patient_profile rename to patient_profile_unpartitioned;
+
+create table patient_profile (
+    like patient_profile_unpartitioned including all excluding indexes,
+    team_id text not null default 'default',
+    primary key (team_id, patient_id),
+    foreign key (patient_id, team_id) references patient_directory (patient_id, team_id)
+) partition by hash (team_id, patient_id);
+
+create table patient_profile_p0 partition of patient_profile for values with (modulus 8, remainder 0);
+create table patient_profile_p1 partition of patient_profile for values with (modulus 8, remainder 1);
+create table patient_profile_p2 partition of patient_profile for values with (modulus 8, remainder 2);
+create table patient_profile_p3 partition of patient_profile for values with (modulus 8, remainder 3);
+create table patient_profile_p4 partition of patient_profile for values with (modulus 8, remainder 4);
+create table patient_profile_p5 partition of patient_profile for values with (modulus 8, remainder 5);
+create table patient_profile_p6 partition of patient_profile for values with (modulus 8, remainder 6);
+create table patient_profile_p7 partition of patient_profile for values with (modulus 8, remainder 7);
+
+-- Login looks a profile up by patient_id alone, before the tenant is known
+create index patient_profile_patient_idx on patient_profile (patient_id);
+
+-- The app only inserts profiles; register each one in the directory first, which
+-- rejects a second profile for the same patient_id under any team. It runs as the
+-- owner because the directory has no policies for app roles.
+create function register_patient() returns trigger
+language plpgsql security definer set search_path = public as $$
+begin
+    insert into patient_directory (patient_id, team_id) values (new.patient_id, new.team_id);
+    return new;
+end;
+$$;
+
+create trigger patient_profile_register
+    before insert on patient_profile
+    for each row execute function register_patient();
+
+insert into patient_profile overriding system value
+    select *, 'default' from patient_profile_unpartitioned;
+
+-- Logs -------------------------------------------------------------------
+
+alter table patient_log rename to patient_log_unpartitioned;
+
+create table patient_log (
+    like patient_log_unpartitioned including all excluding indexes,
+    team_id text not null default 'default',
+    primary key (team_id, patient_id, token)
+) partition by hash (team_id, patient_id);
+
+create table patient_log_p0 partition of patient_log for values with (modulus 16, remainder 0);
+create table patient_log_p1 partition of patient_log for values with (modulus 16, remainder 1);
+create table patient_log_p2 partition of patient_log for values with (modulus 16, remainder 2);
+create table patient_log_p3 partition of patient_log for values with (modulus 16, remainder 3);
+create table patient_log_p4 partition of patient_log for values with (modulus 16, remainder 4);
+create table patient_log_p5 partition of patient_log for values with (modulus 16, remainder 5);
+create table patient_log_p6 partition of patient_log for values with (modulus 16, remainder 6);
+create table patient_log_p7 partition of patient_log for values with (modulus 16, remainder 7);
+create table patient_log_p8 partition of patient_log for values with (modulus 16, remainder 8);
+create table patient_log_p9 partition of patient_log for values with (modulus 16, remainder 9);
+create table patient_log_p10 partition of patient_log for values with (modulus 16, remainder 10);
+create table patient_log_p11 partition of patient_log for values with (modulus 16, remainder 11);
+create table patient_log_p12 partition of patient_log for values with (modulus 16, remainder 12);
+create table patient_log_p13 partition of patient_log for values with (modulus 16, remainder 13);
+create table patient_log_p14 partition of patient_log for values with (modulus 16, remainder 14);
+create table patient_log_p15 partition of patient_log for values with (modulus 16, remainder 15);
+
+-- Every per-patient query (dashboard, history pages) is a range scan on this index
+create index patient_log_tenant_history_idx
+    on patient_log (team_id, patient_id, date desc, time desc, token desc);
+
+insert into patient_log overriding system value
+    select *, 'default' from patient_log_unpartitioned;
+
+-- Identity sequences and row-level security ----------------------------------
+
+do $$
+declare
+    col record;
+    policy record;
+    partition record;
+begin
+    -- Copied identity columns start a new sequence; continue after the migrated rows
+    for col in
+        select table_name, column_name from information_schema.columns
+        where table_schema = current_schema() and is_identity = 'YES'
+          and table_name in ('patient_profile', 'patient_log')
+    loop
+        execute format(
+            'select setval(pg_get_serial_sequence(%L, %L), coalesce(max(%I), 0) + 1, false) from %I',
+            col.table_name, col.column_name, col.column_name, col.table_name
+        );
+    end loop;
+
+    -- Policies stayed on the renamed tables; re-create each one on its replacement
+    for policy in
+        select * from pg_policies
+        where schemaname = current_schema()
+          and tablename in ('patient_profile_unpartitioned', 'patient_log_unpartitioned')
+    loop
+        execute format(
+            'create policy %I on %I as %s for %s to %s %s %s',
+            policy.policyname, replace(policy.tablename, '_unpartitioned', ''), policy.permissive, policy.cmd,
+            array_to_string(policy.roles, ', '),
+            coalesce('using (' || policy.qual || ')', ''),
+            coalesce('with check (' || policy.with_check || ')', '')
+        );
+    end loop;
+
+    -- Partitions get no policies: with RLS enabled, direct access to them is denied
+    for partition in
+        select inhrelid::regclass as name from pg_inherits
+        where inhparent in ('patient_profile'::regclass, 'patient_log'::regclass)
+    loop
+        execute format('alter table %s enable row level security', partition.name);
+    end loop;
+end;
+$$;
+
+alter table patient_profile enable row level security;
+alter table patient_log enable row level security;
+
+commit;
+
+-- Dedicated table for a large club (example) ---------------------------------
+--
+-- create table patient_log_<team_id> (
+--     like patient_log including all excluding indexes,
+--     team_id text not null default '<team_id>',
+--     primary key (team_id, patient_id, token)
+-- );
+-- alter table patient_log_<team_id> enable row level security;
+-- -- then re-create patient_log's policies on it (see pg_policies)
+-- create index patient_log_<team_id>_history_idx
+--     on patient_log_<team_id> (team_id, patient_id, date desc, time desc, token desc);
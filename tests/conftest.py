@@ -0,0 +1,22 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import pytest
+import streamlit
+
+PROFILE_TABLE = "patient_profile"
+LOG_TABLE = "patient_log"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def secrets(tmp_path_factory):
+    # Table names for app_utils.tenant_table; read before any test touches st.secrets
+    path = tmp_path_factory.mktemp("secrets") / "secrets.toml"
+    path.write_text(
+        "[supabase]\n"
+        f'SUPABASE_TABLE = "{PROFILE_TABLE}"\n'
+        f'SUPABASE_PATIENT_LOG_TABLE = "{LOG_TABLE}"\n'
+    )
+    streamlit.config.set_option("secrets.files", [str(path)])
@@ -0,0 +1,52 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from alerts import AlertPipeline, AlertStateStore, MemorySink
+
+
+def log(severity, symptoms="", patient_id="p1"):
+    return {"patient_id": patient_id, "symptom_severity": severity, "symptoms": symptoms, "date": "2025-01-01"}
+
+
+def make_pipeline(path=":memory:"):
+    sink = MemorySink()
+    return AlertPipeline(sink, AlertStateStore(path)), sink
+
+
+def test_threshold_alerts_through_worker():
+    pipeline, sink = make_pipeline()
+    pipeline.submit(log(3))
+    pipeline.submit(log(9), contacts=["0123", ""])
+    pipeline.join()
+    assert len(sink.alerts) == 1
+    assert sink.alerts[0].reasons == ["Symptom severity 9/10"]
+    assert sink.alerts[0].contacts == ["0123"]
+
+
+def test_delta_needs_baseline():
+    pipeline, sink = make_pipeline()
+    assert pipeline.process(log(2)) is None
+    assert pipeline.process(log(6)) is None
+    for _ in range(3):
+        pipeline.process(log(2))
+    alert = pipeline.process(log(6))
+    assert alert is not None and alert.reasons[0].startswith("Severity rose to 6")
+
+
+def test_red_flag_alerts_once_per_patient():
+    pipeline, sink = make_pipeline()
+    assert pipeline.process(log(2, "Headache, Blurred vision")).reasons == ["New symptom: Blurred vision"]
+    assert pipeline.process(log(2, "Blurred vision")) is None
+    assert pipeline.process(log(2, "Blurred vision", patient_id="p2")) is not None
+
+
+def test_state_survives_restart(tmp_path):
+    path = str(tmp_path / "alerts.db")
+    pipeline, _ = make_pipeline(path)
+    for _ in range(3):
+        pipeline.process(log(2, "Nausea"))
+
+    restarted, sink = make_pipeline(path)
+    assert restarted.process(log(2, "Nausea")) is None
+    assert restarted.process(log(6)).reasons[0].startswith("Severity rose to 6")
@@ -0,0 +1,51 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from feature_store import FeatureStore
+
+
+def log(day, severity, mood=3):
+    return {"date": f"2025-01-{day:02d}", "time": "09:00", "symptom_severity": severity, "mood": mood,
+            "symptoms": "Headache"}
+
+
+def rebuilt(logs):
+    store = FeatureStore(":memory:")
+    store.rebuild("p1", logs)
+    return store.vector("p1")
+
+
+def test_in_order_updates_match_rebuild():
+    logs = [log(day, day % 7 + 1) for day in range(1, 11)]
+    store = FeatureStore(":memory:")
+    for entry in logs:
+        store.update("p1", entry)
+    assert not store.is_stale("p1")
+    np.testing.assert_allclose(store.vector("p1"), rebuilt(logs))
+
+
+def test_backdated_update_is_corrected_by_sync():
+    logs = [log(day, 2) for day in range(2, 10)]
+    store = FeatureStore(":memory:")
+    for entry in logs:
+        store.update("p1", entry)
+    backdated = log(1, 9, mood=1)
+    store.update("p1", backdated)
+    assert store.is_stale("p1")
+
+    store.sync("p1", logs)      # stale read from before the save: ignored
+    assert store.is_stale("p1")
+    store.sync("p1", logs + [backdated])
+    assert not store.is_stale("p1")
+    np.testing.assert_allclose(store.vector("p1"), rebuilt(logs + [backdated]))
+
+
+def test_shorter_logs_never_replace_features():
+    logs = [log(day, day) for day in range(1, 6)]
+    store = FeatureStore(":memory:")
+    store.rebuild("p1", logs)
+    store.sync("p1", logs[:3])
+    assert store.log_count("p1") == 5
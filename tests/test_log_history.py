@@ -0,0 +1,69 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from conftest import LOG_TABLE
+from fakes import FakeSupabase
+from log_history import LogHistory, SORT_KEY, fetch_logs_after
+
+
+def make_db(rows):
+    db = FakeSupabase()
+    db.tables[LOG_TABLE] = [dict(row, patient_id=row.get("patient_id", "p1"), team_id="default") for row in rows]
+    return db
+
+
+def tied_logs():
+    # Several logs share a date, and some also share a time, so only the token breaks the tie
+    return [
+        {"date": f"2025-01-0{day}", "time": time, "token": f"{day}{time}{suffix}", "symptom_severity": severity}
+        for day in (1, 2, 3)
+        for time in ("08:00", "20:00")
+        for suffix, severity in (("a", 2), ("b", 7), ("c", 4))
+    ]
+
+
+def newest_first(rows):
+    return sorted(rows, key=lambda row: tuple(row[k] for k in SORT_KEY), reverse=True)
+
+
+def all_pages(history, client):
+    pages, number = [], 0
+    while True:
+        pages.append(history.page(client, number))
+        if not history.has_next(client, number):
+            return pages
+        number += 1
+
+
+def test_keyset_pages_through_ties_without_gaps_or_repeats():
+    logs = tied_logs()
+    db = make_db(logs)
+    pages = all_pages(LogHistory("p1", page_size=4, tenant_id="default"), db)
+    assert [len(page) for page in pages] == [4, 4, 4, 4, 2]
+    assert [row["token"] for page in pages for row in page] == [row["token"] for row in newest_first(logs)]
+
+
+def test_exact_multiple_of_page_size_has_no_empty_last_page():
+    db = make_db(tied_logs())
+    history = LogHistory("p1", page_size=6, tenant_id="default")
+    pages = all_pages(history, db)
+    assert [len(page) for page in pages] == [6, 6, 6]
+    assert history.exhausted
+    assert history.page(db, 3) == []
+
+
+def test_prefetch_reads_visible_page_and_the_next():
+    db = make_db(tied_logs())
+    history = LogHistory("p1", page_size=4, tenant_id="default")
+    history.page(db, 0)
+    assert len(history.pages) == 2 and not history.exhausted
+
+
+def test_filters_are_pushed_down_and_other_patients_excluded():
+    logs = tied_logs() + [{"date": "2025-01-09", "time": "09:00", "token": "x", "symptom_severity": 9,
+                           "patient_id": "p2"}]
+    db = make_db(logs)
+    rows = fetch_logs_after(db, "p1", filters={"min_severity": 5}, limit=100, tenant_id="default")
+    assert [row["token"] for row in rows] == [row["token"] for row in newest_first(logs[:-1])
+                                               if row["symptom_severity"] >= 5]
@@ -0,0 +1,54 @@
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+import notes_search
+from notes_search import NotesIndex
+
+
+def note(token, patient_id, text):
+    return {"token": token, "patient_id": patient_id, "date": "2025-01-01", "doctor_notes": text}
+
+
+def test_keyword_search_filters_patients_in_match():
+    index = NotesIndex(":memory:")
+    index.add_many([note("a", "u-1", "neck pain"), note("b", "u-2", "neck pain"), note("c", "u-1", "rest")])
+    assert [n["token"] for n in index.keyword_search("neck")] == ["b", "a"]
+    assert [n["token"] for n in index.keyword_search("neck", ["u-1"])] == ["a"]
+    assert index.keyword_search("neck", ["u-3"]) == []
+
+
+def test_semantic_search_keeps_top_across_chunks(monkeypatch):
+    monkeypatch.setattr(notes_search, "VECTOR_CHUNK", 7)
+    vectors = np.random.default_rng(0).standard_normal((40, 8)).astype(np.float32)
+    index = NotesIndex(":memory:", dimensions=8)
+    index.add_many([note(str(i), f"p{i % 4}", f"note {i}") for i in range(40)], vectors)
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(unit @ unit[5]))
+
+    assert [n["token"] for n in index.semantic_search(None, vector=vectors[5], limit=5)] == \
+        [str(i) for i in expected[:5]]
+    assert [n["token"] for n in index.semantic_search(None, ["p1"], vector=vectors[5], limit=3)] == \
+        [str(i) for i in expected if i % 4 == 1][:3]
+
+
+def test_sync_retries_missing_embeddings():
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        if len(calls) == 1:
+            raise RuntimeError("rate limited")
+        return [1.0, 0.0]
+
+    index = NotesIndex(":memory:", embed=embed, dimensions=2)
+    log = note("a", "u-1", "neck pain")
+    index.add_async(log)
+    index._executor.submit(lambda: None).result()
+    assert index.semantic_search(None, vector=[1.0, 0.0]) == []
+
+    index.sync([log])
+    index._executor.submit(lambda: None).result()
+    assert [n["token"] for n in index.semantic_search(None, vector=[1.0, 0.0])] == ["a"]
@@ -0,0 +1,57 @@
+import os
+import sys
+import zipfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from conftest import LOG_TABLE, PROFILE_TABLE
+from fakes import FakeSupabase, synthetic_patients
+from reports import ReportWorkers, fetch_team_patients, logs_frame, render_csv, render_report
+
+PROFILE = {"patient_id": "p1", "patient_name": "Test Patient", "dob": "2005-01-01"}
+
+
+def log(day, severity=4):
+    return {"date": f"2025-01-{day:02d}", "time": "09:00", "symptom_severity": severity, "symptoms": "Headache",
+            "mood": 3, "sleep_quality": "Good", "logged_at": f"2025-01-{day:02d}T09:00:00"}
+
+
+def test_pdf_report_embeds_figures(tmp_path):
+    path = render_report(PROFILE, [log(1), log(2, 6)], "pdf", str(tmp_path / "report.pdf"))
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data.startswith(b"%PDF")
+    assert b"/Subtype /Image" in data
+
+
+def test_csv_report_without_logs():
+    assert render_csv(PROFILE, logs_frame([])).decode().startswith("patient_name,")
+
+
+def test_team_patients_read_in_pages():
+    db = FakeSupabase()
+    patient_ids = synthetic_patients(db, PROFILE_TABLE, LOG_TABLE, 3, 5)
+    patients = fetch_team_patients(db, "default", page_size=4)
+    assert sorted(profile["patient_id"] for profile, _ in patients) == sorted(patient_ids)
+    assert [len(logs) for _, logs in patients] == [5, 5, 5]
+
+
+@pytest.fixture
+def workers(tmp_path):
+    workers = ReportWorkers(max_workers=1, report_dir=str(tmp_path))
+    yield workers
+    workers.pool.shutdown()
+    workers.exports.shutdown()
+
+
+def test_bulk_export_skips_failed_reports(workers):
+    patients = [
+        (PROFILE, [log(1)]),
+        ({"patient_id": "p2"}, []),
+        ({"patient_id": "p3"}, [log(1, "severe")]),     # non-numeric severity can't be averaged
+    ]
+    archive, failed = workers.export_bulk(patients, "pdf")
+    assert failed == ["p3"]
+    with zipfile.ZipFile(archive) as bundle:
+        assert sorted(bundle.namelist()) == ["p1.pdf", "p2.pdf"]
@@ -0,0 +1,145 @@
+# warmup.py
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+import streamlit as st
+
+from app_utils import (
+    create_supabase_client, current_tenant, fetch_patient_logs, get_log_versions, load_model,
+    MODEL_NAME, COMBINED_MODEL_NAME
+)
+from feature_store import get_feature_store
+from log_history import LogHistory, fetch_recent_logs
+
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupStats:
+    """Process-wide counts of whether the warm-up finished before a session's first page visit."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = 0
+        self.failed = 0
+        self.beat_first_click = 0
+        self.lost_to_first_click = 0
+        # Seconds the warm-up finished ahead of the first visit (wins)
+        self.leads = deque(maxlen=1000)
+        # Seconds the warm-up was still running after the first visit (losses), recorded when it finishes
+        self.lags = deque(maxlen=1000)
+
+    def record_start(self):
+        with self._lock:
+            self.started += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failed += 1
+
+    def record_finish(self, warmup, finished_at):
+        with self._lock:
+            warmup.finished_at = finished_at
+            if warmup.visited_at is not None:
+                self.lags.append(finished_at - warmup.visited_at)
+
+    def record_first_visit(self, warmup, visited_at):
+        with self._lock:
+            warmup.visited_at = visited_at
+            if warmup.finished_at is not None:
+                self.beat_first_click += 1
+                self.leads.append(visited_at - warmup.finished_at)
+            else:
+                self.lost_to_first_click += 1
+
+    def snapshot(self):
+        with self._lock:
+            visits = self.beat_first_click + self.lost_to_first_click
+            return {
+                "started": self.started,
+                "failed": self.failed,
+                "first_visits": visits,
+                "beat_first_click": self.beat_first_click,
+                "hit_rate": round(self.beat_first_click / visits, 3) if visits else None,
+                "median_lead_seconds": round(statistics.median(self.leads), 3) if self.leads else None,
+                "median_lag_seconds": round(statistics.median(self.lags), 3) if self.lags else None
+            }
+
+
+@st.cache_resource
+def get_warmup_stats():
+    return WarmupStats()
+
+
+class Warmup:
+    def __init__(self, patient_id, tenant_id, diagnosis_date):
+        self.patient_id = patient_id
+        self.tenant_id = tenant_id
+        self.diagnosis_date = diagnosis_date
+        self.finished_at = None
+        # (log version, LogHistory with the unfiltered first pages loaded)
+        self.log_history = None
+        self.visited_at = None
+        self.first_visit = None
+        self.thread = threading.Thread(target=self._run, name="login-warmup", daemon=True)
+
+    def _run(self):
+        stats = get_warmup_stats()
+        try:
+            load_model(MODEL_NAME)
+            if os.path.exists(COMBINED_MODEL_NAME):
+                load_model(COMBINED_MODEL_NAME)
+            client = create_supabase_client()
+            version = get_log_versions().get(self.patient_id)
+            logs = fetch_patient_logs(client, self.patient_id, self.tenant_id, version)
+            get_feature_store().sync(self.patient_id, logs, self.diagnosis_date)
+            fetch_recent_logs(client, self.patient_id, self.tenant_id, version)
+            history = LogHistory(self.patient_id, tenant_id=self.tenant_id)
+            history.page(client, 0)
+            self.log_history = (version, history)
+            import embeddings  # creates the OpenAI client
+            stats.record_finish(self, time.monotonic())
+        except Exception:
+            stats.record_failure()
+            logger.exception("Warm-up failed for %s", self.patient_id)
+
+
+def start_warmup():
+    """Preload the classifier, database client, the patient's logs and their first Log History pages
+    once per session, after login."""
+    if "warmup" in st.session_state:
+        return st.session_state.warmup
+    warmup = Warmup(
+        st.session_state.patient_id,
+        current_tenant(),
+        st.session_state.get("patient_diagnosis_date")
+    )
+    st.session_state.warmup = warmup
+    get_warmup_stats().record_start()
+    warmup.thread.start()
+    return warmup
+
+
+def prefetched_log_history():
+    """The warm-up's unfiltered LogHistory, or None if it isn't ready or a log was saved since."""
+    warmup = st.session_state.get("warmup")
+    if warmup is None or warmup.log_history is None:
+        return None
+    version, history = warmup.log_history
+    return history if version == get_log_versions().get(warmup.patient_id) else None
+
+
+def record_first_visit(page):
+    """Call at the top of a page; counts whether the warm-up was ready for the session's first navigation."""
+    warmup = st.session_state.get("warmup")
+    if warmup is None or warmup.first_visit is not None:
+        return
+    warmup.first_visit = page
+    stats = get_warmup_stats()
+    stats.record_first_visit(warmup, time.monotonic())
+    logger.info("Warm-up %s first visit to %s: %s", "ready for" if warmup.finished_at else "not ready for",
+                page, stats.snapshot())